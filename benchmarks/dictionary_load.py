@@ -0,0 +1,90 @@
+"""
+Compares the startup time and memory usage of the packed dictionaries against the source modules
+
+Each measurement runs in a fresh interpreter, which loads the dictionary, then reads every word and
+looks a batch of syllables up, so that the memory-mapped pages are really touched before measuring the peak RSS. The packed dictionaries need to be built first (`python -m jklmbot.data build`).
+
+Usage: python benchmarks/dictionary_load.py [LANGUAGE...]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+LANGUAGES = ("english", "french", "nahuatl")
+
+SYLLABLES = ("ing", "ar", "st", "ou", "re", "qu", "el", "tion", "tla", "hu")
+"""The syllables looked up after loading a dictionary"""
+
+_SNIPPETS = {
+    "baseline": ("pass", "pass"),
+    # the bot used to scan the whole word list for every syllable
+    "import": ("from jklmbot.data.{language} import DICTIONARY as words",
+               "for syllable in SYLLABLES: [word for word in words if syllable in word]"),
+    "packed": ("from jklmbot.data.packed import load_dictionary; words = load_dictionary('{language}'); index = words.syllable_index()",
+               "for syllable in SYLLABLES: list(index.candidates(syllable))"),
+}
+
+_MEASURE = """
+import json, resource, time
+SYLLABLES = {syllables!r}
+start = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+sum(len(word) for word in words)
+{use}
+used = time.perf_counter()
+print(json.dumps({{"load": loaded - start, "use": used - loaded, "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def measure(load: str, use: str = "pass") -> dict:
+    """
+    Runs the given snippets in a new interpreter
+
+    Parameters
+    ----------
+    load: str
+        Loads the dictionary as `words`
+    use: str, default = "pass"
+        Looks `SYLLABLES` up, run after every word has been read
+
+    Returns
+    -------
+    dict
+        The time spent loading the dictionary and reading it (in secs) and the peak RSS of the interpreter
+        (in KiB on Linux, in bytes on macOS)
+    """
+    if load == "pass":
+        load = "words = ()"
+    output = subprocess.run([sys.executable, "-c", _MEASURE.format(syllables=SYLLABLES, load=load, use=use)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def entry():
+    """the main entrypoint"""
+    parser = argparse.ArgumentParser(description="Benchmarks the dictionaries loading")
+    parser.add_argument("languages", nargs="*", default=LANGUAGES)
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="The number of runs to keep the best from.")
+    args = parser.parse_args()
+
+    # makes sure the bytecode caches exist so that only warm loads are measured
+    for language in args.languages:
+        for method in ("import", "packed"):
+            measure(_SNIPPETS[method][0].format(language=language))
+
+    baseline = min((measure(*_SNIPPETS["baseline"]) for _ in range(args.repeat)), key=lambda result: result["rss"])
+    print(f"{'language':<10} {'method':<8} {'load (ms)':>10} {'use (ms)':>10} {'RSS (KiB)':>10}")
+    for language in args.languages:
+        for method in ("import", "packed"):
+            load, use = _SNIPPETS[method]
+            results = [measure(load.format(language=language), use) for _ in range(args.repeat)]
+            loading = min(result["load"] for result in results) * 1000
+            using = min(result["use"] for result in results) * 1000
+            rss = min(result["rss"] for result in results) - baseline["rss"]
+            print(f"{language:<10} {method:<8} {loading:>10.2f} {using:>10.2f} {'+' + str(rss):>10}")
+
+
+if __name__ == "__main__":
+    entry()
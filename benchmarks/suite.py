@@ -0,0 +1,159 @@
+"""
+Measures the bot on every language: dictionary load time and peak RSS, candidate lookup time,
+and, against the local stand-in server, the time from the syllable being shown to [Enter] being pressed
+and the time spent typing and submitting each answer
+
+Usage: python benchmarks/suite.py [LANGUAGE...] [--turns TURNS] [--events] [--submit {keys,script}] [--typing {constant,gaussian,zero}] [--no-browser]
+"""
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import time
+import typing
+
+from dictionary_load import LANGUAGES, measure
+
+from jklmbot.languages import REGISTRY, SUPPORTED_LANGUAGES
+from jklmbot.metrics import Metrics
+from jklmbot.ranking import STRATEGIES, ranked_candidates
+from jklmbot.submit import SUBMIT_MODES, TYPING_MODELS, get_typing_model
+
+_LOAD_SNIPPET = "from jklmbot.languages import REGISTRY; words = REGISTRY.get('{language}').dictionary"
+
+
+def sample_syllables(language: str, count: int, seed: int = 0) -> typing.List[str]:
+    """
+    Picks syllables which have enough candidates in the given language
+
+    Parameters
+    ----------
+    language: str
+    count: int
+    seed: int, default = 0
+
+    Returns
+    -------
+    list[str]
+    """
+    index = REGISTRY.get(language).index
+    syllables = sorted(syllable for syllable in index if len(syllable) in (2, 3) and len(index.positions(syllable)) >= 50)
+    return random.Random(seed).sample(syllables, min(count, len(syllables)))
+
+
+def lookup_times(language: str, syllables: typing.List[str], strategy: str = "first") -> typing.List[float]:
+    """
+    Measures the time needed to find an unused candidate for each syllable (in µs)
+
+    Parameters
+    ----------
+    language: str
+    syllables: list[str]
+    strategy: str, default = "first"
+        How to rank the candidates
+
+    Returns
+    -------
+    list[float]
+    """
+    loaded = REGISTRY.get(language)
+    used = set()
+    results = []
+    for syllable in syllables:
+        start = time.perf_counter()
+        candidates = ranked_candidates(loaded.index, loaded.features, syllable, strategy=strategy, exclude=used)
+        word = next((word for word in candidates if word not in used), None)
+        results.append((time.perf_counter() - start) * 1e6)
+        used.add(word)
+    return results
+
+
+def turn_times(language: str, syllables: typing.List[str], turns: int, **options) -> typing.Tuple[typing.List[dict], typing.List[float]]:
+    """
+    Lets the bot play against the stand-in server
+
+    Parameters
+    ----------
+    language: str
+    syllables: list[str]
+    turns: int
+    **options
+        The options given to `jklmbot.__main__.run`
+
+    Returns
+    -------
+    tuple[list[dict], list[float]]
+        The turns reported by the stand-in server and the time spent submitting each answer (in ms)
+    """
+    from playwright.sync_api import sync_playwright
+
+    from jklmbot.__main__ import run
+    from jklmbot.standin import StandInServer
+
+    server = StandInServer(language=SUPPORTED_LANGUAGES[language], syllables=syllables, turns=turns).start()
+    metrics = Metrics()
+    try:
+        with sync_playwright() as playwright, contextlib.redirect_stdout(io.StringIO()):
+            run(playwright, room=language, base_url=server.url, max_turns=turns, headless=True, max_delay=0, metrics=metrics, **options)
+        return server.results(language, timeout=5) or [], [duration * 1000 for duration in metrics.durations("submit")]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def summary(values: typing.List[float]) -> str:
+    """
+    Parameters
+    ----------
+    values: list[float]
+
+    Returns
+    -------
+    str
+        The mean, median, 95th percentile and maximum of the values
+    """
+    if not values:
+        return "n/a"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"mean {statistics.mean(ordered):.2f} | p50 {statistics.median(ordered):.2f} | p95 {p95:.2f} | max {ordered[-1]:.2f}"
+
+
+def entry():
+    """the main entrypoint"""
+    parser = argparse.ArgumentParser(description="Benchmarks the bot")
+    parser.add_argument("languages", nargs="*", default=LANGUAGES)
+    parser.add_argument("--turns", "-t", type=int, default=10, help="The number of turns to play against the stand-in server.")
+    parser.add_argument("--lookups", type=int, default=500, help="The number of syllables to look up.")
+    parser.add_argument("--keypress-delay", "-k", type=float, default=0, help="The delay between each keypress (in ms).")
+    parser.add_argument("--check-delay", "-c", type=float, default=1, help="The delay before checking the answer (in secs).")
+    parser.add_argument("--strategy", "-s", choices=STRATEGIES, default="first", help="How to rank the candidates.")
+    parser.add_argument("--typing", choices=TYPING_MODELS, default="constant", help="How the delays between the keypresses are chosen.")
+    parser.add_argument("--submit", choices=SUBMIT_MODES, default="keys", help="How the answers are sent.")
+    parser.add_argument("--events", action="store_true", help="Uses the event-driven mode.")
+    parser.add_argument("--no-browser", action="store_true", help="Skips the end-to-end turns.")
+    args = parser.parse_args()
+
+    for language in args.languages:
+        print(f"🧪 {SUPPORTED_LANGUAGES[language]}")
+        load = measure(_LOAD_SNIPPET.format(language=language))
+        print(f"   load + index: {load['load'] * 1000:.2f} ms, peak RSS {load['rss']} KiB (once every word was read)")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            syllables = sample_syllables(language, args.lookups)
+        print(f"   lookup (µs): {summary(lookup_times(language, syllables, args.strategy))}")
+
+        if args.no_browser:
+            continue
+        results, submits = turn_times(language, syllables[:args.turns], args.turns, check_delay=args.check_delay,
+                                      event_driven=args.events, strategy=args.strategy, submit_mode=args.submit,
+                                      typing_model=get_typing_model(args.typing, delay=args.keypress_delay))
+        accepted = [turn for turn in results if turn["outcome"] == "accepted"]
+        print(f"   turns: {len(accepted)}/{len(results)} accepted")
+        print(f"   syllable shown -> [Enter] (ms): {summary([turn['submit'] for turn in accepted])}")
+        print(f"   submit, {args.submit} with {args.typing} delays (ms): {summary(submits)}")
+
+
+if __name__ == "__main__":
+    entry()
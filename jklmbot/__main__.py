@@ -1,138 +1,26 @@
 """the core of this script"""
 import argparse
-import base64
+import asyncio
 import pathlib
 import random
+import sys
 import time
 import typing
 
-from playwright.sync_api import Page, Playwright, sync_playwright
+from playwright.sync_api import Playwright, sync_playwright
 
-from jklmbot import __version__
-from jklmbot.data.english import DICTIONARY as ENGLISH_DICTIONARY
-from jklmbot.data.french import DICTIONARY as FRENCH_DICTIONARY
-from jklmbot.data.german import DICTIONARY as GERMAN_DICTIONARY
-from jklmbot.data.italian import DICTIONARY as ITALIAN_DICTIONARY
-from jklmbot.data.nahuatl import DICTIONARY as NAHUATL_DICTIONARY
-from jklmbot.data.spanish import DICTIONARY as SPANISH_DICTIONARY
+from jklmbot import __version__, aio
+from jklmbot.data.build import build_missing
+from jklmbot.events import GameEvents
+from jklmbot.languages import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
+from jklmbot.metrics import NULL_METRICS, Metrics
+from jklmbot.ranking import STRATEGIES
+from jklmbot.state import GameState
+from jklmbot.submit import SUBMIT_MODES, TYPING_MODELS, ConstantDelay, Submitter, TypingModel, get_typing_model
+from jklmbot.utils import encode_picture, get_browser_from_name, random_username, settings_script
 
 
-def generate_user_id() -> str:
-    """
-    Returns
-    -------
-    str
-    """
-    return "".join(random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-") for _ in range(16))
-
-
-def is_jpeg(data: bytes) -> bool:
-    """
-    Determine if the given object is a JPEG file
-
-    Parameters
-    ----------
-    data: bytes
-
-    Returns
-    -------
-    bool
-    """
-    buf = data[:max(8192, len(data))]
-    return (len(buf) > 2 and
-            buf[0] == 0xFF and
-            buf[1] == 0xD8 and
-            buf[2] == 0xFF)
-
-
-def get_browser_from_name(name: str):
-    """
-    Parameters
-    ----------
-    name: str
-    """
-    name = str(name).lower().replace(" ", "")
-    if name in ("firefox", "gecko"):
-        return "firefox"
-    elif name in ("webkit", "safari", "mac", "macos", "ios"):
-        return "webkit"
-    else:
-        return "chromium"
-
-
-def get_syllable(page: Page):
-    """
-    Parameters
-    ----------
-    page: Page
-    """
-    print("Getting the syllable...")
-    syllable = str(page.frame_locator("iframe >> nth=0").locator(".syllable").text_content()).lower()
-    print(f"🧃 The syllable is '{syllable}'")
-    return syllable
-
-
-def get_dictionary(page: Page):
-    """
-    Parameters
-    ----------
-    page: Page
-    """
-    print("🌐 Searching for the right dictionary...")
-    language = str(page.frame_locator("iframe >> nth=0").locator(".dictionary").text_content()).lower().replace(" ", "")
-    # print(f"Debug: `.dictionary` seems to be {language}")
-    if language == "french":
-        print("🧃 Found the French dictionary")
-        DICTIONARY = FRENCH_DICTIONARY
-    elif language == "german":
-        print("🧃 Found the German dictionary")
-        DICTIONARY = GERMAN_DICTIONARY
-    elif language == "spanish":
-        print("🧃 Found the Spanish dictionary")
-        DICTIONARY = SPANISH_DICTIONARY
-    elif language == "italian":
-        print("🧃 Found the Italian dictionary")
-        DICTIONARY = ITALIAN_DICTIONARY
-    elif language == "nahuatl":
-        print("🧃 Found the Nahuatl dictionary")
-        DICTIONARY = NAHUATL_DICTIONARY
-
-    elif language == "breton":
-        print("😥 We do not support Breton yet (using the English dictionary)")
-        DICTIONARY = ENGLISH_DICTIONARY
-    elif language.startswith("brazilian"):
-        print("😥 We do not support Braizilian Portuguese yet (using the English dictionary)")
-        DICTIONARY = ENGLISH_DICTIONARY
-    elif "pokemon" in language:
-        print("😥 We do not support Pokemon languages yet (using the English dictionary)")
-        DICTIONARY = ENGLISH_DICTIONARY
-
-    else:
-        print("🧃 Found the English dictionary")
-        DICTIONARY = ENGLISH_DICTIONARY
-
-    return DICTIONARY
-
-
-def join_game(page: Page):
-    """
-    Parameters
-    ----------
-    page: Page
-    """
-    # Click text=Join game
-    print("Joining game")
-
-    JOINED = False
-    while not JOINED:
-        try:
-            page.frame_locator("iframe >> nth=0").get_by_role("button", name="Join game").click(timeout=1000)
-            JOINED = True
-        except Exception:
-            JOINED = page.frame_locator("iframe >> nth=0").get_by_role("textbox").is_visible()
-
-
-def run(playwright: Playwright, room: str, max_delay: float = 3, username: str = None, picture: pathlib.Path = None, check_delay: float = 1, keypress_delay: float = 100, headless: bool = False, browser: str = "chromium") -> None:
+def run(playwright: Playwright, room: str, max_delay: float = 3, username: str = None, picture: pathlib.Path = None, check_delay: float = 1, keypress_delay: float = 100, headless: bool = False, browser: str = "chromium", track_others: bool = False, event_driven: bool = False, base_url: str = "https://jklm.fun", max_turns: typing.Optional[int] = None, metrics: typing.Optional[Metrics] = None, strategy: str = "first", submit_mode: str = "keys", typing_model: typing.Optional[TypingModel] = None) -> None:
     """
     Runs the bot to play jklm
 
@@ -154,23 +42,35 @@ def run(playwright: Playwright, room: str, max_delay: float = 3, username: str =
         If the browser should be ran in headless mode or not.
     browser: str, default = "chromium"
         The browser to use.
+    track_others: bool, default = False
+        If the words played by the other players should be avoided too.
+    event_driven: bool, default = False
+        If the game state changes should be pushed from the browser instead of being polled.
+        `check_delay` then becomes the maximum time to wait for the answer to be checked.
+    base_url: str, default = "https://jklm.fun"
+        The URL of the server hosting the rooms.
+    max_turns: int, default = None
+        The number of turns to play before stopping. Plays forever when None.
+    metrics: Metrics, default = None
+        Records the time spent in each phase of the turns, labelled with the room. Nothing is recorded when None.
+    strategy: str, default = "first"
+        How to rank the candidates (see `jklmbot.ranking.STRATEGIES`).
+    submit_mode: str, default = "keys"
+        How the answers are sent (see `jklmbot.submit.SUBMIT_MODES`).
+    typing_model: TypingModel, default = None
+        The time waited after each keypress. When None, `keypress_delay` is waited after every keypress.
 
     Returns
     -------
     None
     """
     if picture is not None:
-        if not isinstance(picture, bytes):
-            with open(picture, "r+b") as f:
-                picture = f.read()
-
-        if not is_jpeg(picture):
-            raise TypeError("❌ The given picture does not seem to be a JPEG image")
-
-        picture = base64.b64encode(picture).decode("utf-8")
-        picture_length = len(picture)
-        if picture_length > 10000:
-            raise TypeError(f"❌ The given picture is too big ({picture_length}/10000)")
+        picture = encode_picture(picture)
+    # the turns of every room are counted apart
+    metrics = NULL_METRICS if metrics is None else metrics.room(room)
+    if typing_model is None:
+        typing_model = ConstantDelay(keypress_delay)
+    submitter = Submitter(mode=submit_mode, model=typing_model)
 
     browser = get_browser_from_name(browser)
     if browser == "firefox":
@@ -183,16 +83,16 @@ def run(playwright: Playwright, room: str, max_delay: float = 3, username: str =
     context = browser.new_context()
     # Open new page
     page = context.new_page()
+    events = GameEvents(page) if event_driven else None
     if picture:
         if not username:
-            username = f"Guest{''.join(random.choice('0123456789') for _ in range(4))}"
-        page.add_init_script(script=f"""
-        window.localStorage.setItem("jklmSettings", '{{"version":2,"volume":0.5,"muted":false,"chatFilter":[],"nickname":"{username}", "picture": "{picture}"}}')
-        """)
+            username = random_username()
+        page.add_init_script(script=settings_script(username, picture))
 
     # Go to https://jklm.fun/{room}
-    print(f"Going to https://jklm.fun/{room}")
-    page.goto(f"https://jklm.fun/{room}")
+    room_url = f"{base_url.rstrip('/')}/{room}"
+    print(f"Going to {room_url}")
+    page.goto(room_url)
     # Click text=OK
     print("Entering username")
     JOINABLE = False
@@ -210,40 +110,39 @@ def run(playwright: Playwright, room: str, max_delay: float = 3, username: str =
             Console().print_exception()
             JOINABLE = page.frame_locator("iframe >> nth=0").get_by_role("button", name="Join game").is_visible() or page.frame_locator("iframe >> nth=0").get_by_role("textbox").is_visible()
 
-    join_game(page)
-    USED_WORDS = []
-    while True:
+    state = GameState(page, events=events, track_others=track_others)
+    state.join()
+    state.new_round()
+    turns = 0
+    while max_turns is None or turns < max_turns:
+        metrics.turn()
         print("🍡 Waiting for the input to be visible...")
-
-        VISIBLE = False
-        while not VISIBLE:
-            try:
-                page.frame_locator("iframe >> nth=0").get_by_role("textbox").wait_for(state="visible", timeout=1000)
-                VISIBLE = True
-            except Exception:
-                if page.frame_locator("iframe >> nth=0").get_by_role("button", name="Join game").is_visible():
-                    join_game(page)
+        with metrics.span("wait_input"):
+            state.wait_for_turn()
 
         print("✅ Input visible")
         print("Waiting a bit to to not be caught")
         time.sleep(random.random() * max_delay)
         # Click .syllable
-        syllable = get_syllable(page)
-        page.frame_locator("iframe >> nth=0").get_by_role("textbox").click()
-        for element in get_dictionary(page):
-            if syllable in element and element not in USED_WORDS:
-                try:
-                    print(f"Found '{element}' which has '{syllable}'")
-                    page.frame_locator("iframe >> nth=0").get_by_role("textbox").type(element, delay=keypress_delay)
-                    print("Pressing [Enter]")
-                    USED_WORDS.append(element)
-                    page.frame_locator("iframe >> nth=0").get_by_role("textbox").press("Enter")
-                    time.sleep(check_delay)
-                    if not page.frame_locator("iframe >> nth=0").get_by_role("textbox").is_visible():
-                        break
-                    syllable = get_syllable(page)
-                except Exception:
-                    time.sleep(0.1)
+        with metrics.span("get_syllable"):
+            syllable = state.syllable()
+        state.textbox.click()
+        with metrics.span("get_dictionary"):
+            language = state.language()
+        state.sync_used_words()
+        turn = state.turn(language, syllable, strategy)
+        while True:
+            with metrics.span("search"):
+                element = turn.next_word()
+            if element is None:
+                break
+            try:
+                print(f"Found '{element}' which has '{turn.syllable}'")
+                if state.answer(turn, element, submitter, check_delay=check_delay, metrics=metrics):
+                    break
+            except Exception:
+                time.sleep(0.1)
+        turns += 1
     # ---------------------
     context.close()
     browser.close()
@@ -255,7 +154,8 @@ def entry():
     parser.add_argument("--version", "-v", action="version", version=__version__)
 
     # parser.add_argument('--version', '-v', action='version', version=translatepy.__version__)
-    parser.add_argument("--room", "-r", action="store", type=str, help="The room to enter.", required=True)
+    parser.add_argument("--room", "-r", action="extend", nargs="+", type=str,
+                        help="The room to enter. Several rooms are played concurrently from a single browser.", required=True)
     parser.add_argument("--username", "-u", action="store", type=str, help="The username to use.", required=False, default=None)
     parser.add_argument("--picture", "-p", action="store", type=str, help="The profile picture to use.", required=False, default=None)
     parser.add_argument("--browser", "-b", action="store", type=str,
@@ -266,21 +166,74 @@ def entry():
                         help="The maximum delay before searching for answers to avoid being caught (in secs).", required=False, default=3)
     parser.add_argument("--key", "--key-delay", "--keystroke-delay", "--keyboard-delay", "--keypress-delay", "-k", action="store", type=float,
                         help="The delay between each keypress for the input to appear more realistic (in ms).", required=False, default=100)
+    parser.add_argument("--typing", action="store", type=str, choices=TYPING_MODELS,
+                        help="How the delays between the keypresses are chosen (zero is only meant for local benchmarks).", required=False, default="constant")
+    parser.add_argument("--key-deviation", action="store", type=float,
+                        help="The standard deviation of the delays between the keypresses with the gaussian typing model (in ms).", required=False, default=None)
+    parser.add_argument("--submit", action="store", type=str, choices=SUBMIT_MODES,
+                        help="Wether to send the answers one keypress at a time or all at once from a script.", required=False, default="keys")
     parser.add_argument("--check", "--check-delay", "-c", action="store", type=float,
                         help="The delay before checking if the answer is right or not (in secs).", required=False, default=1)
+    parser.add_argument("--track-others", action="store_true",
+                        help="Wether to avoid the words already played by the other players.")
+    parser.add_argument("--events", action="store_true",
+                        help="Wether to react to the game events pushed by the browser instead of polling the page.")
+    parser.add_argument("--base-url", action="store", type=str,
+                        help="The URL of the server hosting the rooms.", required=False, default="https://jklm.fun")
+    parser.add_argument("--strategy", "-s", action="store", type=str, choices=STRATEGIES,
+                        help="How to pick the words among the candidates.", required=False, default="first")
+    parser.add_argument("--metrics", action="store", type=str,
+                        help="The JSON-lines file to record the time spent in each phase of the turns to.", required=False, default=None)
+    parser.add_argument("--metrics-port", action="store", type=int,
+                        help="The port to serve the turns phases histograms on (Prometheus format, at /metrics).", required=False, default=None)
 
     args = parser.parse_args()
 
-    with sync_playwright() as playwright:
-        try:
-            run(playwright, room=args.room, max_delay=args.delay, username=args.username, picture=args.picture,
-                check_delay=args.check, keypress_delay=args.key, headless=args.headless, browser=args.browser)
-        except Exception as err:
-            # from rich.console import Console
-            # Console().print_exception()
-            print("")
-            print(" ".join(err.args))
-            print("")
+    # building a dictionary takes a few seconds, which would make us lose turns if done during the game
+    failed = build_missing()
+    if DEFAULT_LANGUAGE in failed:
+        print(f"❌ Couldn't build the {SUPPORTED_LANGUAGES[DEFAULT_LANGUAGE]} dictionary: {failed[DEFAULT_LANGUAGE]}")
+        sys.exit(1)
+    for language, err in failed.items():
+        # the registry falls back to the default language
+        print(f"😥 Couldn't build the {SUPPORTED_LANGUAGES.get(language, language)} dictionary, "
+              f"the {SUPPORTED_LANGUAGES[DEFAULT_LANGUAGE]} one will be used instead: {err}")
+
+    model = get_typing_model(args.typing, delay=args.key, deviation=args.key_deviation)
+
+    metrics = None
+    if args.metrics is not None or args.metrics_port is not None:
+        metrics = Metrics(path=args.metrics, port=args.metrics_port)
+
+    try:
+        if len(args.room) > 1:
+            try:
+                asyncio.run(aio.main(args.room, max_delay=args.delay, username=args.username, picture=args.picture,
+                                     check_delay=args.check, keypress_delay=args.key, headless=args.headless, browser=args.browser,
+                                     track_others=args.track_others, event_driven=args.events, base_url=args.base_url,
+                                     metrics=metrics, strategy=args.strategy, submit_mode=args.submit, typing_model=model))
+            except Exception as err:
+                print("")
+                print(" ".join(str(arg) for arg in err.args))
+                print("")
+            return
+
+        with sync_playwright() as playwright:
+            try:
+                run(playwright, room=args.room[0], max_delay=args.delay, username=args.username, picture=args.picture,
+                    check_delay=args.check, keypress_delay=args.key, headless=args.headless, browser=args.browser,
+                    track_others=args.track_others, event_driven=args.events, base_url=args.base_url,
+                    metrics=metrics, strategy=args.strategy, submit_mode=args.submit, typing_model=model)
+            except Exception as err:
+                # from rich.console import Console
+                # Console().print_exception()
+                print("")
+                print(" ".join(err.args))
+                print("")
+    finally:
+        if metrics is not None:
+            metrics.close()
+            print(metrics.summary())
 
 
 if __name__ == "__main__":
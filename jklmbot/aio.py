@@ -0,0 +1,188 @@
+"""the asyncio engine, to play in several rooms from a single process"""
+import asyncio
+import pathlib
+import random
+import typing
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+from jklmbot.events import AsyncGameEvents
+from jklmbot.metrics import NULL_METRICS, Metrics
+from jklmbot.state import AsyncGameState
+from jklmbot.submit import AsyncSubmitter, ConstantDelay, TypingModel
+from jklmbot.utils import encode_picture, get_browser_from_name, random_username, settings_script
+
+
+async def launch_browser(playwright: Playwright, browser: str = "chromium", headless: bool = False) -> Browser:
+    """
+    Parameters
+    ----------
+    playwright: playwright.async_api.Playwright
+    browser: str, default = "chromium"
+        The browser to use.
+    headless: bool, default = False
+        If the browser should be ran in headless mode or not.
+
+    Returns
+    -------
+    Browser
+    """
+    browser = get_browser_from_name(browser)
+    if browser == "firefox":
+        return await playwright.firefox.launch(headless=headless)
+    elif browser == "webkit":
+        return await playwright.webkit.launch(headless=headless)
+    return await playwright.chromium.launch(headless=headless)
+
+
+async def run(browser: Browser, room: str, max_delay: float = 3, username: str = None, picture: pathlib.Path = None, check_delay: float = 1, keypress_delay: float = 100, track_others: bool = False, event_driven: bool = False, base_url: str = "https://jklm.fun", max_turns: typing.Optional[int] = None, metrics: typing.Optional[Metrics] = None, strategy: str = "first", submit_mode: str = "keys", typing_model: typing.Optional[TypingModel] = None) -> None:
+    """
+    Runs the bot to play jklm in a new context of the given browser
+
+    Parameters
+    ----------
+    browser: Browser | playwright.async_api.Browser
+        The browser to run the bot from, which can be shared between several rooms
+    room: str
+        The room code to enter
+    max_delay: float, default = 3
+        The maximum delay to use after getting a word before searching anything
+    username: str, default = None
+        The username to use. When None, uses the default random username.
+    check_delay: float, default = 1
+        The time to wait before checking if the answer was correct.
+    keypress_delay: float, default = 100
+        The delay between each keypress.
+    track_others: bool, default = False
+        If the words played by the other players should be avoided too.
+    event_driven: bool, default = False
+        If the game state changes should be pushed from the browser instead of being polled.
+        `check_delay` then becomes the maximum time to wait for the answer to be checked.
+    base_url: str, default = "https://jklm.fun"
+        The URL of the server hosting the rooms.
+    max_turns: int, default = None
+        The number of turns to play before stopping. Plays forever when None.
+    metrics: Metrics, default = None
+        Records the time spent in each phase of the turns, labelled with the room. Nothing is recorded when None.
+    strategy: str, default = "first"
+        How to rank the candidates (see `jklmbot.ranking.STRATEGIES`).
+    submit_mode: str, default = "keys"
+        How the answers are sent (see `jklmbot.submit.SUBMIT_MODES`).
+    typing_model: TypingModel, default = None
+        The time waited after each keypress. When None, `keypress_delay` is waited after every keypress.
+
+    Returns
+    -------
+    None
+    """
+    if picture is not None:
+        picture = encode_picture(picture)
+    # the turns of every room are counted apart
+    metrics = NULL_METRICS if metrics is None else metrics.room(room)
+    if typing_model is None:
+        typing_model = ConstantDelay(keypress_delay)
+    submitter = AsyncSubmitter(mode=submit_mode, model=typing_model)
+
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        events = await AsyncGameEvents.attach(page) if event_driven else None
+        if picture:
+            if not username:
+                username = random_username()
+            await page.add_init_script(script=settings_script(username, picture))
+
+        room_url = f"{base_url.rstrip('/')}/{room}"
+        print(f"Going to {room_url}")
+        await page.goto(room_url)
+        print("Entering username")
+        JOINABLE = False
+
+        while not JOINABLE:
+            try:
+                if username is not None:
+                    await page.get_by_placeholder("Your name").click()
+                    await page.get_by_placeholder("Your name").fill(username)
+                    await page.get_by_role("button", name="OK").click()
+                else:
+                    await page.locator("button.styled").click(timeout=1000)
+            except Exception:
+                JOINABLE = (await page.frame_locator("iframe >> nth=0").get_by_role("button", name="Join game").is_visible()
+                            or await page.frame_locator("iframe >> nth=0").get_by_role("textbox").is_visible())
+
+        state = AsyncGameState(page, events=events, track_others=track_others)
+        await state.join()
+        await state.new_round()
+        turns = 0
+        while max_turns is None or turns < max_turns:
+            metrics.turn()
+            print(f"🍡 [{room}] Waiting for the input to be visible...")
+            with metrics.span("wait_input"):
+                await state.wait_for_turn()
+
+            print(f"✅ [{room}] Input visible")
+            await asyncio.sleep(random.random() * max_delay)
+            with metrics.span("get_syllable"):
+                syllable = await state.syllable()
+            await state.textbox.click()
+            with metrics.span("get_dictionary"):
+                language = await state.language()
+            await state.sync_used_words()
+            turn = state.turn(language, syllable, strategy)
+            while True:
+                with metrics.span("search"):
+                    element = turn.next_word()
+                if element is None:
+                    break
+                try:
+                    print(f"[{room}] Found '{element}' which has '{turn.syllable}'")
+                    if await state.answer(turn, element, submitter, check_delay=check_delay, metrics=metrics):
+                        break
+                except Exception:
+                    await asyncio.sleep(0.1)
+            turns += 1
+    finally:
+        await context.close()
+
+
+async def run_rooms(playwright: Playwright, rooms: typing.Iterable[str], headless: bool = False, browser: str = "chromium", **kwargs) -> None:
+    """
+    Runs the bot in every given room, sharing a single browser and the loaded dictionaries
+
+    Parameters
+    ----------
+    playwright: playwright.async_api.Playwright
+        The Playwright context to run the bot from
+    rooms: Iterable[str]
+        The room codes to enter
+    headless: bool, default = False
+        If the browser should be ran in headless mode or not.
+    browser: str, default = "chromium"
+        The browser to use.
+    **kwargs
+        The other options, passed to `run` for every room
+
+    Returns
+    -------
+    None
+    """
+    shared_browser = await launch_browser(playwright, browser=browser, headless=headless)
+    try:
+        await asyncio.gather(*(run(shared_browser, room, **kwargs) for room in rooms))
+    finally:
+        await shared_browser.close()
+
+
+async def main(rooms: typing.Iterable[str], **kwargs) -> None:
+    """
+    Starts Playwright and runs the bot in every given room
+
+    Parameters
+    ----------
+    rooms: Iterable[str]
+        The room codes to enter
+    **kwargs
+        The options passed to `run_rooms`
+    """
+    async with async_playwright() as playwright:
+        await run_rooms(playwright, rooms, **kwargs)
@@ -0,0 +1,33 @@
+"""builds the packed dictionaries"""
+import argparse
+import time
+
+from jklmbot.data.build import build_dictionary
+from jklmbot.data.packed import LANGUAGES
+
+
+def entry():
+    """the main entrypoint"""
+    parser = argparse.ArgumentParser(prog='jklmbot.data', description='Manage the jklmbot dictionaries')
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Normalizes the source word lists and packs them with their index.")
+    build_parser.add_argument("languages", nargs="*", default=LANGUAGES,
+                              help=f"The languages to pack (default: {', '.join(LANGUAGES)}).")
+    build_parser.add_argument("--source", action="store", type=str, required=False, default=None,
+                              help="The word list to use instead of the language module (a .py list or a text file with one word per line).")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.source is not None and len(args.languages) != 1:
+            parser.error("--source needs exactly one language")
+        for language in args.languages:
+            start = time.perf_counter()
+            stats = build_dictionary(language, source=args.source)
+            elapsed = time.perf_counter() - start
+            print(f"📦 {language} ({elapsed:.2f}s): {stats}")
+
+
+if __name__ == "__main__":
+    entry()
@@ -0,0 +1,267 @@
+"""turns the source word lists into packed dictionaries"""
+import ast
+import collections
+import pathlib
+import re
+import time
+import tokenize
+import typing
+import unicodedata
+
+from jklmbot.data.packed import LANGUAGES, PackedDictionary, missing_dictionaries, pack, packed_path, source_path
+
+
+class NormalizationRules:
+    """
+    How the words of a language are normalized to what can be typed in the game
+
+    Parameters
+    ----------
+    keep: str, default = ""
+        The accented letters which are kept as is
+    replacements: dict[str, str], default = None
+        The letters which are replaced before the accents get stripped
+    """
+
+    def __init__(self, keep: str = "", replacements: typing.Optional[typing.Dict[str, str]] = None) -> None:
+        self.keep = str(keep)
+        self.replacements = dict(replacements or {})
+        letters = "a-z" + re.escape(self.keep)
+        # letters, optionally joined by single hyphens or apostrophes
+        self._valid = re.compile(f"[{letters}]+(?:['-][{letters}]+)*")
+
+    def strip_accents(self, word: str) -> str:
+        """
+        Parameters
+        ----------
+        word: str
+
+        Returns
+        -------
+        str
+            The word without the accents of the letters which are not kept
+        """
+        for letter, replacement in self.replacements.items():
+            word = word.replace(letter, replacement)
+        if word.isascii():
+            return word
+        return "".join(letter if letter in self.keep
+                       else "".join(part for part in unicodedata.normalize("NFD", letter) if not unicodedata.combining(part))
+                       for letter in word)
+
+    def is_valid(self, word: str) -> bool:
+        """
+        Parameters
+        ----------
+        word: str
+            A normalized word
+
+        Returns
+        -------
+        bool
+            If the game can accept the word
+        """
+        return self._valid.fullmatch(word) is not None
+
+
+DEFAULT_RULES = NormalizationRules()
+
+RULES = {
+    "french": NormalizationRules(replacements={"œ": "oe", "æ": "ae"}),
+    "german": NormalizationRules(replacements={"ß": "ss"}),
+    "spanish": NormalizationRules(keep="ñ"),
+}
+"""The normalization rules of each language (DEFAULT_RULES being used for the other ones)"""
+
+_SEPARATORS = re.compile(r"[,;/]")
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_QUOTES = str.maketrans({"’": "'", "‘": "'", "‐": "-", "–": "-"})
+
+
+class BuildStats:
+    """
+    What happened to the entries of a source word list
+
+    Attributes
+    ----------
+    entries: int
+        The number of entries in the source
+    words: int
+        The number of words once the multi-word entries are split
+    invalid: collections.Counter
+        The number of dropped words, by reason
+    duplicates: int
+        The number of words dropped because they appeared several times
+    packed: int
+        The number of packed words
+    source_size: int
+        The size of the source (in bytes)
+    packed_sizes: dict[str, int]
+        The size of the words, the syllable index and the words features in the packed dictionary (in bytes)
+    """
+
+    def __init__(self) -> None:
+        self.entries = 0
+        self.words = 0
+        self.invalid: typing.Counter[str] = collections.Counter()
+        self.duplicates = 0
+        self.packed = 0
+        self.source_size = 0
+        self.packed_sizes: typing.Dict[str, int] = {}
+
+    @property
+    def packed_size(self) -> int:
+        """The size of the packed dictionary sections (in bytes)"""
+        return sum(self.packed_sizes.values())
+
+    def __str__(self) -> str:
+        dropped = self.words - self.packed
+        dropped_share = dropped / self.words if self.words else 0
+        reasons = ", ".join(f"{count} {reason}" for reason, count in self.invalid.most_common())
+        sizes = " + ".join(f"{name} {size / 1e6:.2f} MB" for name, size in self.packed_sizes.items())
+        return (f"{self.entries} entries -> {self.words} words -> {self.packed} kept "
+                f"({dropped} words dropped, {dropped_share:.1%}: {reasons + ', ' if reasons else ''}{self.duplicates} duplicates), "
+                f"source {self.source_size / 1e6:.2f} MB -> packed {self.packed_size / 1e6:.2f} MB ({sizes})")
+
+
+def iter_source(path: typing.Union[str, pathlib.Path]) -> typing.Iterator[str]:
+    """
+    Streams the entries of a source word list, without importing it
+
+    Parameters
+    ----------
+    path: str | pathlib.Path
+        A Python module holding a list of string literals, or a text file with one entry per line
+
+    Returns
+    -------
+    Iterator[str]
+    """
+    path = pathlib.Path(path)
+    if path.suffix == ".py":
+        with open(path, "rb") as f:
+            for token in tokenize.tokenize(f.readline):
+                if token.type == tokenize.STRING:
+                    yield ast.literal_eval(token.string)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+def split_entry(entry: str) -> typing.List[str]:
+    """
+    Splits an entry holding several words (`"tlatta , inani"`) and drops its annotations (between parentheses)
+
+    Parameters
+    ----------
+    entry: str
+
+    Returns
+    -------
+    list[str]
+    """
+    entry = _PARENTHESES.sub(" ", str(entry))
+    return [word.strip(" \t.!?\"") for word in _SEPARATORS.split(entry) if word.strip(" \t.!?\"")]
+
+
+def normalize_words(entries: typing.Iterable[str], language: str, stats: typing.Optional[BuildStats] = None) -> typing.Iterator[str]:
+    """
+    Normalizes the given source entries, dropping anything the game can't accept
+
+    The words are split, lowercased and stripped from their accents according to the language rules.
+    Duplicates are not removed.
+
+    Parameters
+    ----------
+    entries: Iterable[str]
+    language: str
+    stats: BuildStats, default = None
+        Updated with what happened to the entries
+
+    Returns
+    -------
+    Iterator[str]
+    """
+    rules = RULES.get(language, DEFAULT_RULES)
+    if stats is None:
+        stats = BuildStats()
+    for entry in entries:
+        stats.entries += 1
+        for word in split_entry(entry):
+            stats.words += 1
+            word = rules.strip_accents(word.lower().translate(_QUOTES))
+            if any(character.isspace() for character in word):
+                stats.invalid["with spaces"] += 1
+            elif not rules.is_valid(word):
+                stats.invalid["with invalid characters"] += 1
+            else:
+                yield word
+
+
+def build_dictionary(language: str, source: typing.Optional[typing.Union[str, pathlib.Path]] = None) -> BuildStats:
+    """
+    Builds the packed dictionary of the given language
+
+    Parameters
+    ----------
+    language: str
+    source: str | pathlib.Path, default = None
+        The source word list. Defaults to the `jklmbot.data` module of the language.
+
+    Returns
+    -------
+    BuildStats
+
+    Raises
+    ------
+    ModuleNotFoundError
+        When there is no source for the given language
+    OSError
+        When the packed dictionary can't be written
+    """
+    source = source_path(language) if source is None else pathlib.Path(source)
+    if not source.is_file():
+        raise ModuleNotFoundError(f"No source word list for '{language}'", name=f"jklmbot.data.{language}")
+
+    stats = BuildStats()
+    # keeps the source order, which ranks the words
+    words: typing.Dict[str, None] = {}
+    for word in normalize_words(iter_source(source), language, stats):
+        if word in words:
+            stats.duplicates += 1
+        else:
+            words[word] = None
+
+    path = packed_path(language)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats.packed = pack(words, path)
+    stats.source_size = source.stat().st_size
+    stats.packed_sizes = PackedDictionary(path).sizes()
+    return stats
+
+
+def build_missing(languages: typing.Iterable[str] = LANGUAGES) -> typing.Dict[str, Exception]:
+    """
+    Builds the packed dictionaries which are missing or were built for another format version
+
+    Parameters
+    ----------
+    languages: Iterable[str], default = LANGUAGES
+
+    Returns
+    -------
+    dict[str, Exception]
+        The languages which couldn't be built, with the reason
+    """
+    failed: typing.Dict[str, Exception] = {}
+    for language in missing_dictionaries(languages):
+        print(f"📦 Building the {language} dictionary, which is only done once...")
+        start = time.perf_counter()
+        try:
+            stats = build_dictionary(language)
+        except (ModuleNotFoundError, OSError) as err:
+            failed[language] = err
+            continue
+        print(f"📦 {language} ({time.perf_counter() - start:.2f}s): {stats}")
+    return failed
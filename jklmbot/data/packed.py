@@ -0,0 +1,422 @@
+"""the memory-mapped on-disk dictionary format
+
+A packed dictionary file starts with a header holding the position of every section
+(every integer is a little-endian uint32 and every section is aligned on 4 bytes):
+
+    MAGIC (8 bytes) | VERSION | COUNT | MAX_LENGTH | KEYS | POSTING_SIZE | positions of the sections...
+
+followed by the sections:
+
+- WORD_OFFSETS (COUNT + 1 integers) and WORDS: the sorted words encoded in UTF-8, each one followed
+  by a newline, WORD_OFFSETS[i] being the position of the i-th word inside WORDS.
+- KEY_OFFSETS (KEYS + 1 integers) and KEY_WORDS: the syllable index substrings, laid out like the words.
+- POSTING_OFFSETS (KEYS + 1 integers) and POSTINGS: the positions of the words containing each substring,
+  as uint16 when the dictionary has at most 65536 words (POSTING_SIZE being 2) or as uint32 (POSTING_SIZE being 4).
+  The single letters, which appear in most of the words, have no postings: they are
+  looked up in the words the first time they are needed.
+- ALPHABET, LENGTHS (uint16), LETTERS (uint32), RARITY (float32) and RANKS (uint32): the words features,
+  RANKS[i] being the position of the i-th word in the source word list.
+
+The file is memory-mapped when loaded: words are only decoded when accessed and
+the index and features are used in place.
+"""
+import array
+import bisect
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import typing
+
+from jklmbot import __version__
+from jklmbot.index import MAX_SYLLABLE_LENGTH, SyllableIndex
+
+if typing.TYPE_CHECKING:  # the features are only needed once ranking, not to read the words
+    from jklmbot.ranking import WordFeatures
+
+MAGIC = b"JKLMDICT"
+VERSION = 4
+EXTENSION = ".jkd"
+
+DATA_DIRECTORY = pathlib.Path(__file__).parent
+"""Where the source word lists are"""
+
+CACHE_ENVIRONMENT_VARIABLE = "JKLMBOT_CACHE"
+"""The environment variable overriding the directory the packed dictionaries are built to"""
+
+LANGUAGES = ("english", "french", "nahuatl")
+"""The languages which have a source word list"""
+
+_SECTIONS = ("word_offsets", "words", "key_offsets", "keys", "posting_offsets", "postings",
+             "alphabet", "lengths", "letters", "rarity", "ranks", "end")
+_HEADER = struct.Struct("<8sIIIII" + "I" * len(_SECTIONS))
+_PREAMBLE = struct.Struct("<8sI")
+
+
+def _typed_view(view: memoryview, typecode: str) -> typing.Sequence:
+    """Returns the little-endian integers or floats of the given bytes, without copying them when possible"""
+    if sys.byteorder == "little":
+        return view.cast(typecode)
+    # `array.array(typecode, view)` would take every byte as an item
+    values = array.array(typecode)
+    values.frombytes(view)
+    values.byteswap()
+    return values
+
+
+_POSTING_TYPECODES = {2: "H", 4: "I"}
+
+
+class _PackedPostings(typing.Mapping[str, typing.Sequence[int]]):
+    """The postings of a packed dictionary, the single letters ones being found in the words when first needed"""
+
+    def __init__(self, dictionary: "PackedDictionary", postings: typing.Dict[str, typing.Sequence[int]], letters: typing.Iterable[str], typecode: str) -> None:
+        self._dictionary = dictionary
+        self._postings = postings
+        self._letters = set(letters)
+        self._typecode = typecode
+
+    def __getitem__(self, key: str) -> typing.Sequence[int]:
+        try:
+            return self._postings[key]
+        except KeyError:
+            if key not in self._letters:
+                raise
+        # about as long as building the postings of a letter, but only done for the letters actually asked for
+        positions = array.array(self._typecode, (position for position, word in enumerate(self._dictionary) if key in word))
+        self._postings[key] = positions
+        return positions
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._postings or key in self._letters
+
+    def __iter__(self) -> typing.Iterator[str]:
+        yield from self._postings
+        yield from (letter for letter in self._letters if letter not in self._postings)
+
+    def __len__(self) -> int:
+        return len(self._postings) + len(self._letters - self._postings.keys())
+
+
+class PackedDictionary(typing.Sequence[str]):
+    """
+    A read-only, memory-mapped view over a packed dictionary file
+
+    Parameters
+    ----------
+    path: str | pathlib.Path
+        The path to the packed dictionary
+
+    Raises
+    ------
+    ValueError
+        When the file is not a packed dictionary or uses another format version
+    """
+
+    def __init__(self, path: typing.Union[str, pathlib.Path]) -> None:
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"❌ {self.path} is not a packed dictionary")
+        if version != VERSION:
+            raise ValueError(f"❌ {self.path} uses an unsupported format version ({version})")
+
+        _, _, self._count, self.max_length, self._keys, self._posting_size, *positions = _HEADER.unpack_from(self._mmap, 0)
+        view = memoryview(self._mmap)
+        self._sections = {name: view[start:end] for name, start, end in zip(_SECTIONS, positions, positions[1:])}
+        self._offsets = _typed_view(self._sections["word_offsets"], "I")
+        self._words = self._sections["words"]
+        self._index: typing.Optional[SyllableIndex] = None
+        self._features: typing.Optional["WordFeatures"] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _word(self, position: int) -> str:
+        # the `- 1` drops the trailing newline
+        return str(self._words[self._offsets[position]:self._offsets[position + 1] - 1], "utf-8")
+
+    @typing.overload
+    def __getitem__(self, position: int) -> str: ...
+
+    @typing.overload
+    def __getitem__(self, position: slice) -> typing.List[str]: ...
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._word(i) for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("packed dictionary index out of range")
+        return self._word(position)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        for position in range(self._count):
+            yield self._word(position)
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        # the words are sorted, so a binary search is enough
+        position = bisect.bisect_left(self, word)
+        return position < self._count and self._word(position) == word
+
+    def __repr__(self) -> str:
+        return f"PackedDictionary({str(self.path)!r}, words={self._count})"
+
+    def syllable_index(self) -> SyllableIndex:
+        """
+        Returns
+        -------
+        SyllableIndex
+            The stored syllable index, used in place
+        """
+        if self._index is None:
+            key_offsets = _typed_view(self._sections["key_offsets"], "I")
+            keys = bytes(self._sections["keys"]).decode("utf-8").split("\n")
+            posting_offsets = _typed_view(self._sections["posting_offsets"], "I")
+            postings = self._sections["postings"]
+            if len(keys) - 1 != self._keys or len(key_offsets) != self._keys + 1:
+                raise ValueError(f"❌ {self.path} has a corrupted index")
+            typecode = _POSTING_TYPECODES[self._posting_size]
+            size = self._posting_size
+            self._index = SyllableIndex.from_postings(self, _PackedPostings(self, {
+                key: _typed_view(postings[posting_offsets[position] * size:posting_offsets[position + 1] * size], typecode)
+                for position, key in enumerate(keys[:-1]) if len(key) > 1
+            }, (key for key in keys[:-1] if len(key) == 1), typecode), max_length=self.max_length)
+        return self._index
+
+    def word_features(self) -> "WordFeatures":
+        """
+        Returns
+        -------
+        WordFeatures
+            The stored words features, used in place
+        """
+        if self._features is None:
+            from jklmbot.ranking import WordFeatures
+            self._features = WordFeatures.from_arrays(
+                bytes(self._sections["alphabet"]).decode("utf-8").rstrip("\0"),
+                _typed_view(self._sections["lengths"], "H")[:self._count],
+                _typed_view(self._sections["letters"], "I"),
+                _typed_view(self._sections["rarity"], "f"),
+                _typed_view(self._sections["ranks"], "I"),
+            )
+        return self._features
+
+    def sizes(self) -> typing.Dict[str, int]:
+        """
+        Returns
+        -------
+        dict[str, int]
+            The size of the words, the syllable index and the words features (in bytes)
+        """
+        groups = {"words": ("word_offsets", "words"),
+                  "index": ("key_offsets", "keys", "posting_offsets", "postings"),
+                  "features": ("alphabet", "lengths", "letters", "rarity", "ranks")}
+        return {group: sum(len(self._sections[section]) for section in sections) for group, sections in groups.items()}
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _joined(strings: typing.Iterable[str]) -> typing.Tuple[bytes, bytes]:
+    """Returns the offsets and the newline-terminated UTF-8 encoding of the given strings"""
+    offsets = array.array("I", [0])
+    encoded = bytearray()
+    for string in strings:
+        encoded += string.encode("utf-8")
+        encoded += b"\n"
+        offsets.append(len(encoded))
+    return _little_endian(offsets), bytes(encoded)
+
+
+def pack(words: typing.Iterable[str], path: typing.Union[str, pathlib.Path], max_length: int = MAX_SYLLABLE_LENGTH) -> int:
+    """
+    Writes the given words, their syllable index and their features to a packed dictionary file
+
+    Parameters
+    ----------
+    words: Iterable[str]
+        The words to pack, in the source word list order (which is kept as the `ranks` feature).
+        They get deduplicated and sorted.
+    path: str | pathlib.Path
+        Where to write the packed dictionary
+    max_length: int, default = 3
+        The maximum length of the indexed substrings
+
+    Returns
+    -------
+    int
+        The number of packed words
+    """
+    from jklmbot.ranking import WordFeatures
+
+    # the position of the first occurrence of each word
+    ranks: typing.Dict[str, int] = {}
+    for word in words:
+        ranks.setdefault(word, len(ranks))
+    words = sorted(ranks)
+    index = SyllableIndex(words, max_length=max_length)
+    features = WordFeatures(index, ranks=(ranks[word] for word in words))
+
+    word_offsets, encoded_words = _joined(words)
+    keys = sorted(key for key, _ in index.items())
+    key_offsets, encoded_keys = _joined(keys)
+    posting_size = 2 if len(words) <= 1 << 16 else 4
+    posting_offsets = array.array("I", [0])
+    postings = array.array(_POSTING_TYPECODES[posting_size])
+    for key in keys:
+        if len(key) > 1:
+            # the single letters are found in the words when loading
+            # iterating keeps `extend` from requiring the same item size
+            postings.extend(iter(index.positions(key)))
+        posting_offsets.append(len(postings))
+
+    sections = [
+        _pad(word_offsets), _pad(encoded_words),
+        _pad(key_offsets), _pad(encoded_keys),
+        _pad(_little_endian(posting_offsets)), _pad(_little_endian(postings)),
+        _pad(features.alphabet.encode("utf-8")),
+        _pad(_little_endian(array.array("H", features.lengths))),
+        _little_endian(array.array("I", features.letters)),
+        _little_endian(array.array("f", features.rarity)),
+        _little_endian(features.ranks),
+    ]
+    positions = [_HEADER.size]
+    for section in sections:
+        positions.append(positions[-1] + len(section))
+
+    path = pathlib.Path(path)
+    # writing to a temporary file first keeps concurrent readers from seeing a half-written dictionary
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(words), max_length, len(keys), posting_size, *positions))
+        for section in sections:
+            f.write(section)
+    os.replace(temporary, path)
+    return len(words)
+
+
+def source_path(language: str) -> pathlib.Path:
+    """
+    Returns the path to the source module of the given language
+
+    Parameters
+    ----------
+    language: str
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    return DATA_DIRECTORY / f"{language}.py"
+
+
+def cache_directory() -> pathlib.Path:
+    """
+    Returns the directory the packed dictionaries are built to
+
+    The installed package might not be writable, so they are kept in the user cache directory
+    (or in `JKLMBOT_CACHE`), under the package version to build them again after an upgrade.
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    override = os.environ.get(CACHE_ENVIRONMENT_VARIABLE)
+    if override:
+        return pathlib.Path(override).expanduser()
+    if sys.platform == "win32":
+        base = pathlib.Path(os.environ.get("LOCALAPPDATA") or pathlib.Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = pathlib.Path.home() / "Library" / "Caches"
+    else:
+        base = pathlib.Path(os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache")
+    return base / "jklmbot" / __version__
+
+
+def packed_path(language: str) -> pathlib.Path:
+    """
+    Returns the path to the packed dictionary of the given language
+
+    Parameters
+    ----------
+    language: str
+
+    Returns
+    -------
+    pathlib.Path
+    """
+    return cache_directory() / f"{language}{EXTENSION}"
+
+
+def load_dictionary(language: str) -> PackedDictionary:
+    """
+    Loads the packed dictionary of the given language
+
+    Nothing is built here, as it would take seconds in the middle of a game:
+    the dictionaries are built ahead of time with `python -m jklmbot.data build`.
+
+    Parameters
+    ----------
+    language: str
+
+    Returns
+    -------
+    PackedDictionary
+        A read-only sequence of the sorted words
+
+    Raises
+    ------
+    ModuleNotFoundError
+        When the language has no source word list
+    FileNotFoundError
+        When the packed dictionary hasn't been built, or was built for another format version
+    """
+    path = packed_path(language)
+    if not path.is_file():
+        if not source_path(language).is_file():
+            raise ModuleNotFoundError(f"No dictionary for '{language}'", name=f"jklmbot.data.{language}")
+        raise FileNotFoundError(f"❌ The {language} dictionary hasn't been built yet (run `python -m jklmbot.data build`)")
+    try:
+        return PackedDictionary(path)
+    except ValueError as err:
+        raise FileNotFoundError(f"{err} (run `python -m jklmbot.data build` to build it again)") from err
+
+
+def missing_dictionaries(languages: typing.Iterable[str] = LANGUAGES) -> typing.List[str]:
+    """
+    Parameters
+    ----------
+    languages: Iterable[str], default = LANGUAGES
+
+    Returns
+    -------
+    list[str]
+        The given languages whose packed dictionary is missing or uses another format version
+    """
+    missing = []
+    for language in languages:
+        try:
+            with open(packed_path(language), "rb") as f:
+                magic, version = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        except (OSError, struct.error):
+            missing.append(language)
+            continue
+        if magic != MAGIC or version != VERSION:
+            missing.append(language)
+    return missing
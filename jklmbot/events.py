@@ -0,0 +1,333 @@
+"""pushes the game state changes from the browser instead of polling them"""
+import asyncio
+import collections
+import time
+import typing
+
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import ConsoleMessage, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+BINDING_NAME = "jklmbotEvent"
+"""The name of the function exposed to the game iframe"""
+
+WAKE_MESSAGE = "jklmbot:event"
+"""The console message logged once an event has been handed to Python"""
+
+JOIN_TIMEOUT = 5
+"""The maximum time to wait for the "Join game" button to be hidden once clicked (in secs)"""
+
+OBSERVER_SCRIPT = """(() => {
+    // only the game iframe is observed
+    if (window === window.top || window.__jklmbotObserver !== undefined) {
+        return;
+    }
+    window.__jklmbotObserver = null;
+
+    const emit = (kind, data) => {
+        if (typeof window.%(binding)s !== "function") {
+            return;
+        }
+        window.%(binding)s(kind, data).then(() => console.debug("%(wake)s"));
+    };
+    const isVisible = (element) => !!(element && (element.offsetWidth || element.offsetHeight || element.getClientRects().length));
+    const text = (selector) => {
+        const element = document.querySelector(selector);
+        return element ? element.textContent : "";
+    };
+
+    // the socket is only hooked once the game defined it, which might be after the observer started
+    let hooked = false;
+    const hookSocket = () => {
+        if (hooked || typeof socket === "undefined" || typeof selfPeerId === "undefined") {
+            return;
+        }
+        hooked = true;
+        socket.on("correctWord", ({ playerPeerId }) => {
+            if (playerPeerId === selfPeerId) {
+                emit("answer", { accepted: true });
+            }
+        });
+        socket.on("failWord", (playerPeerId, reason) => {
+            if (playerPeerId === selfPeerId) {
+                emit("answer", { accepted: false, reason: reason });
+            }
+        });
+    };
+
+    const snapshot = () => ({
+        turn: isVisible(document.querySelector(".selfTurn input, input[type=text]")),
+        syllable: text(".syllable"),
+        dictionary: text(".dictionary"),
+        joinable: Array.from(document.querySelectorAll("button")).some((button) => button.textContent.trim() === "Join game" && isVisible(button)),
+        hooked: hooked,
+    });
+
+    let previous = {};
+    const check = () => {
+        hookSocket();
+        const current = snapshot();
+        for (const [kind, value] of Object.entries(current)) {
+            if (previous[kind] !== value) {
+                emit(kind, value);
+            }
+        }
+        previous = current;
+    };
+
+    const start = () => {
+        window.__jklmbotObserver = new MutationObserver(check);
+        window.__jklmbotObserver.observe(document.documentElement, { subtree: true, childList: true, attributes: true, characterData: true });
+        check();
+    };
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+})();""" % {"binding": BINDING_NAME, "wake": WAKE_MESSAGE}
+"""Observes the game iframe DOM and socket and reports every change through the exposed function"""
+
+
+def _is_wake_message(message: ConsoleMessage) -> bool:
+    return message.text == WAKE_MESSAGE
+
+
+class _EventsReceiver:
+    """
+    Stores the game state changes pushed by the game iframe
+
+    Attributes
+    ----------
+    state: dict
+        The latest known game state (`turn`, `syllable`, `dictionary`, `joinable` and `hooked`)
+    """
+
+    def __init__(self) -> None:
+        self.state: typing.Dict[str, typing.Any] = {"turn": False, "syllable": "", "dictionary": "", "joinable": False, "hooked": False}
+        self._events: typing.Deque[typing.Tuple[str, typing.Any]] = collections.deque()
+
+    @property
+    def hooked(self) -> bool:
+        """If the game socket is hooked: the answers are only pushed once it is, and otherwise take `check_delay` to be known"""
+        return bool(self.state["hooked"])
+
+    def _receive(self, kind: str, data: typing.Any) -> None:
+        if kind in self.state:
+            self.state[kind] = data
+        self._events.append((kind, data))
+
+    def _pop(self, kinds: typing.Container[str]) -> typing.Optional[typing.Tuple[str, typing.Any]]:
+        """Returns the first received event of the given kinds, discarding the ones before it"""
+        while self._events:
+            kind, data = self._events.popleft()
+            if kind in kinds:
+                return kind, data
+        return None
+
+    def clear(self) -> None:
+        """Forgets the events received so far (the state is kept)"""
+        self._events.clear()
+
+
+class GameEvents(_EventsReceiver):
+    """
+    Receives the game state changes pushed by the game iframe
+
+    Must be created before navigating to the room.
+
+    Parameters
+    ----------
+    page: Page
+        The page the game is played on
+    resync_interval: float, default = 1
+        The maximum time to block before looking at the received events again (in secs)
+
+    Attributes
+    ----------
+    state: dict
+        The latest known game state (`turn`, `syllable`, `dictionary`, `joinable` and `hooked`)
+    """
+
+    def __init__(self, page: Page, resync_interval: float = 1) -> None:
+        super().__init__()
+        self.page = page
+        self.resync_interval = float(resync_interval)
+
+        page.expose_function(BINDING_NAME, self._receive)
+        page.add_init_script(script=OBSERVER_SCRIPT)
+
+    def _block(self, timeout: float) -> None:
+        """Lets Playwright dispatch the incoming events until one is received or the timeout expires"""
+        try:
+            self.page.wait_for_event("console", predicate=_is_wake_message, timeout=max(timeout, 0.001) * 1000)
+        except PlaywrightTimeoutError:
+            pass
+
+    def next(self, kinds: typing.Container[str], timeout: typing.Optional[float] = None) -> typing.Optional[typing.Tuple[str, typing.Any]]:
+        """
+        Waits for the next event of the given kinds, discarding the other ones
+
+        Parameters
+        ----------
+        kinds: Container[str]
+            The kinds of event to wait for (`turn`, `syllable`, `dictionary`, `joinable`, `hooked` or `answer`)
+        timeout: float, default = None
+            The maximum time to wait (in secs). Waits forever when None.
+
+        Returns
+        -------
+        tuple[str, Any] | None
+            The kind and data of the event, or None if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            event = self._pop(kinds)
+            if event is not None:
+                return event
+            if deadline is None:
+                self._block(self.resync_interval)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._block(min(remaining, self.resync_interval))
+
+    def wait_until(self, predicate: typing.Callable[[typing.Dict[str, typing.Any]], bool], timeout: typing.Optional[float] = None) -> bool:
+        """
+        Waits until the game state matches the given predicate, discarding the received events
+
+        Parameters
+        ----------
+        predicate: Callable[[dict], bool]
+            Receives the game state
+        timeout: float, default = None
+            The maximum time to wait (in secs). Waits forever when None.
+
+        Returns
+        -------
+        bool
+            If the state matched before the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not predicate(self.state):
+            if deadline is None:
+                self._block(self.resync_interval)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._block(min(remaining, self.resync_interval))
+            self._events.clear()
+        return True
+
+
+class AsyncGameEvents(_EventsReceiver):
+    """
+    The `asyncio` counterpart of `GameEvents`
+
+    Use `AsyncGameEvents.attach` to create it, before navigating to the room.
+
+    Parameters
+    ----------
+    page: playwright.async_api.Page
+        The page the game is played on
+
+    Attributes
+    ----------
+    state: dict
+        The latest known game state (`turn`, `syllable`, `dictionary`, `joinable` and `hooked`)
+    """
+
+    def __init__(self, page: AsyncPage) -> None:
+        super().__init__()
+        self.page = page
+        self._received = asyncio.Event()
+
+    @classmethod
+    async def attach(cls, page: AsyncPage) -> "AsyncGameEvents":
+        """
+        Starts receiving the game events of the given page
+
+        Parameters
+        ----------
+        page: playwright.async_api.Page
+
+        Returns
+        -------
+        AsyncGameEvents
+        """
+        events = cls(page)
+        await page.expose_function(BINDING_NAME, events._receive)
+        await page.add_init_script(script=OBSERVER_SCRIPT)
+        return events
+
+    def _receive(self, kind: str, data: typing.Any) -> None:
+        super()._receive(kind, data)
+        self._received.set()
+
+    async def _block(self, timeout: typing.Optional[float]) -> None:
+        """Waits until an event is received or the timeout expires"""
+        self._received.clear()
+        try:
+            await asyncio.wait_for(self._received.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def next(self, kinds: typing.Container[str], timeout: typing.Optional[float] = None) -> typing.Optional[typing.Tuple[str, typing.Any]]:
+        """
+        Waits for the next event of the given kinds, discarding the other ones
+
+        Parameters
+        ----------
+        kinds: Container[str]
+            The kinds of event to wait for (`turn`, `syllable`, `dictionary`, `joinable`, `hooked` or `answer`)
+        timeout: float, default = None
+            The maximum time to wait (in secs). Waits forever when None.
+
+        Returns
+        -------
+        tuple[str, Any] | None
+            The kind and data of the event, or None if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            event = self._pop(kinds)
+            if event is not None:
+                return event
+            if deadline is None:
+                await self._block(None)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                await self._block(remaining)
+
+    async def wait_until(self, predicate: typing.Callable[[typing.Dict[str, typing.Any]], bool], timeout: typing.Optional[float] = None) -> bool:
+        """
+        Waits until the game state matches the given predicate, discarding the received events
+
+        Parameters
+        ----------
+        predicate: Callable[[dict], bool]
+            Receives the game state
+        timeout: float, default = None
+            The maximum time to wait (in secs). Waits forever when None.
+
+        Returns
+        -------
+        bool
+            If the state matched before the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not predicate(self.state):
+            if deadline is None:
+                await self._block(None)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                await self._block(remaining)
+            self._events.clear()
+        return True
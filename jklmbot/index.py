@@ -0,0 +1,125 @@
+"""indexes the dictionaries by syllable for instant candidate lookups"""
+import array
+import typing
+
+MAX_SYLLABLE_LENGTH = 3
+"""The longest substring stored in the index"""
+
+_EMPTY = array.array("I")
+
+
+class SyllableIndex:
+    """
+    Maps every substring (up to `max_length` characters) of the dictionary words
+    to the positions of the words containing it.
+
+    Parameters
+    ----------
+    dictionary: Sequence[str]
+        The dictionary to index
+    max_length: int, default = 3
+        The maximum length of the indexed substrings
+    """
+
+    def __init__(self, dictionary: typing.Sequence[str], max_length: int = MAX_SYLLABLE_LENGTH) -> None:
+        self.dictionary = dictionary
+        self.max_length = int(max_length)
+
+        postings: typing.Dict[str, array.array] = {}
+        for position, word in enumerate(dictionary):
+            word_length = len(word)
+            substrings = {word[start:start + length]
+                          for length in range(1, self.max_length + 1)
+                          for start in range(word_length - length + 1)}
+            for substring in substrings:
+                try:
+                    postings[substring].append(position)
+                except KeyError:
+                    postings[substring] = array.array("I", (position,))
+        self._postings: typing.Mapping[str, typing.Sequence[int]] = postings
+
+    @classmethod
+    def from_postings(cls, dictionary: typing.Sequence[str], postings: typing.Mapping[str, typing.Sequence[int]],
+                      max_length: int = MAX_SYLLABLE_LENGTH) -> "SyllableIndex":
+        """
+        Creates an index from already computed postings, without scanning the dictionary
+
+        Parameters
+        ----------
+        dictionary: Sequence[str]
+            The indexed dictionary
+        postings: Mapping[str, Sequence[int]]
+            The sorted positions of the words containing each substring. The sequences
+            must support the buffer protocol with 16 or 32-bit unsigned integers (like `array.array("I")`).
+        max_length: int, default = 3
+            The maximum length of the indexed substrings
+
+        Returns
+        -------
+        SyllableIndex
+        """
+        index = cls.__new__(cls)
+        index.dictionary = dictionary
+        index.max_length = int(max_length)
+        index._postings = postings
+        return index
+
+    def items(self) -> typing.ItemsView[str, typing.Sequence[int]]:
+        """
+        Returns
+        -------
+        ItemsView[str, Sequence[int]]
+            Every indexed substring with the positions of the words containing it
+        """
+        return self._postings.items()
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def __contains__(self, syllable: str) -> bool:
+        return syllable in self._postings
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._postings)
+
+    def positions(self, syllable: str) -> typing.Sequence[int]:
+        """
+        Returns the positions, in dictionary order, of the words containing the given syllable
+
+        Note: syllables longer than `max_length` return the positions of the words
+        containing their first `max_length` characters (a superset of the real matches).
+
+        Parameters
+        ----------
+        syllable: str
+
+        Returns
+        -------
+        Sequence[int]
+            16 or 32-bit unsigned integers supporting the buffer protocol
+        """
+        return self._postings.get(str(syllable).lower()[:self.max_length], _EMPTY)
+
+    def candidates(self, syllable: str) -> typing.Iterator[str]:
+        """
+        Iterates over the words containing the given syllable, in dictionary order
+
+        Parameters
+        ----------
+        syllable: str
+
+        Returns
+        -------
+        Iterator[str]
+        """
+        syllable = str(syllable).lower()
+        dictionary = self.dictionary
+        if len(syllable) <= self.max_length:
+            for position in self.positions(syllable):
+                yield dictionary[position]
+        else:
+            for position in self.positions(syllable):
+                word = dictionary[position]
+                if syllable in word:
+                    yield word
+
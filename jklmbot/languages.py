@@ -0,0 +1,179 @@
+"""loads the dictionaries on demand"""
+import collections
+import threading
+import typing
+
+from jklmbot.data.packed import PackedDictionary, load_dictionary
+from jklmbot.index import SyllableIndex
+
+if typing.TYPE_CHECKING:
+    from jklmbot.ranking import WordFeatures
+
+DEFAULT_LANGUAGE = "english"
+
+SUPPORTED_LANGUAGES = {
+    "english": "English",
+    "french": "French",
+    "german": "German",
+    "italian": "Italian",
+    "nahuatl": "Nahuatl",
+    "spanish": "Spanish",
+}
+"""The languages which might have a dictionary, with their display name"""
+
+
+class Language:
+    """
+    A loaded dictionary, its index and the features of its words
+
+    Parameters
+    ----------
+    name: str
+        The name of the language
+    dictionary: Sequence[str]
+        The words of the language
+    index: SyllableIndex
+        The syllable index of the dictionary
+    features: WordFeatures
+        The features used to rank the words
+    """
+
+    def __init__(self, name: str, dictionary: typing.Sequence[str], index: SyllableIndex, features: "WordFeatures") -> None:
+        self.name = name
+        self.dictionary = dictionary
+        self.index = index
+        self.features = features
+
+    def __repr__(self) -> str:
+        return f"Language({self.name!r}, words={len(self.dictionary)})"
+
+
+def resolve_language(text: str) -> str:
+    """
+    Returns the language name from the `.dictionary` element text
+
+    Parameters
+    ----------
+    text: str
+
+    Returns
+    -------
+    str
+    """
+    language = str(text).lower().replace(" ", "")
+    if language in SUPPORTED_LANGUAGES:
+        return language
+
+    if language == "breton":
+        print("😥 We do not support Breton yet (using the English dictionary)")
+    elif language.startswith("brazilian"):
+        print("😥 We do not support Braizilian Portuguese yet (using the English dictionary)")
+    elif "pokemon" in language:
+        print("😥 We do not support Pokemon languages yet (using the English dictionary)")
+    return DEFAULT_LANGUAGE
+
+
+class LanguageRegistry:
+    """
+    Loads the languages the first time they are requested and keeps the most recently used ones in memory
+
+    The registry can be shared between threads: a language is only loaded once, and
+    the languages already loaded are returned without waiting for the other ones to load.
+
+    Parameters
+    ----------
+    max_loaded: int, default = 2
+        The maximum number of languages kept loaded at once
+    """
+
+    def __init__(self, max_loaded: int = 2) -> None:
+        self.max_loaded = max(1, int(max_loaded))
+        self._loaded: "collections.OrderedDict[str, Language]" = collections.OrderedDict()
+        self._missing: typing.Set[str] = set()
+        # only guards the containers above, and is never held while loading
+        self._lock = threading.Lock()
+        # one lock per language, held while it loads
+        self._loading: typing.Dict[str, threading.Lock] = {}
+
+    def __contains__(self, language: str) -> bool:
+        if language in self._missing:
+            language = DEFAULT_LANGUAGE
+        return language in self._loaded
+
+    def _cached(self, language: str) -> typing.Optional[Language]:
+        """Returns the given language if it is already loaded, marking it as the most recently used"""
+        with self._lock:
+            if language in self._missing:
+                language = DEFAULT_LANGUAGE
+            try:
+                self._loaded.move_to_end(language)
+                return self._loaded[language]
+            except KeyError:
+                return None
+
+    def get(self, language: str) -> Language:
+        """
+        Returns the given language, loading it if needed
+
+        Falls back to the default language when the language has no dictionary.
+
+        Parameters
+        ----------
+        language: str
+
+        Returns
+        -------
+        Language
+        """
+        loaded = self._cached(language)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            loading = self._loading.setdefault(language, threading.Lock())
+        with loading:
+            # another thread might have loaded it in the meantime
+            loaded = self._cached(language)
+            if loaded is not None:
+                return loaded
+
+            try:
+                dictionary = load_dictionary(language)
+            except (ModuleNotFoundError, FileNotFoundError) as err:
+                if language == DEFAULT_LANGUAGE:
+                    raise
+                if isinstance(err, ModuleNotFoundError):
+                    print(f"😥 We do not have the {SUPPORTED_LANGUAGES.get(language, language)} dictionary yet (using the English dictionary)")
+                else:
+                    print(f"{err} (using the English dictionary)")
+                with self._lock:
+                    self._missing.add(language)
+                return self.get(DEFAULT_LANGUAGE)
+
+            if isinstance(dictionary, PackedDictionary):
+                # the index and features are stored alongside the words
+                index = dictionary.syllable_index()
+                features = dictionary.word_features()
+            else:
+                from jklmbot.ranking import WordFeatures
+
+                print(f"🗂️ Indexing the {SUPPORTED_LANGUAGES.get(language, language)} dictionary...")
+                index = SyllableIndex(dictionary)
+                features = WordFeatures(index)
+            loaded = Language(language, dictionary, index, features)
+
+            with self._lock:
+                self._loaded[language] = loaded
+                while len(self._loaded) > self.max_loaded:
+                    self._loaded.popitem(last=False)
+            return loaded
+
+    def clear(self) -> None:
+        """Unloads every language"""
+        with self._lock:
+            self._loaded.clear()
+            self._missing.clear()
+
+
+REGISTRY = LanguageRegistry()
+"""The registry shared by every game of the process"""
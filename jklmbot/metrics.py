@@ -0,0 +1,393 @@
+"""times the phases of every turn"""
+import bisect
+import json
+import pathlib
+import threading
+import time
+import typing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+"""The upper bounds of the histograms buckets (in secs)"""
+
+
+class _Span:
+    """Records the time spent in its block"""
+
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics: "NullMetrics", name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+
+
+class _NullSpan:
+    """Does nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullMetrics:
+    """The metrics used when the instrumentation is disabled, which record nothing"""
+
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        """
+        Parameters
+        ----------
+        name: str
+
+        Returns
+        -------
+        _NullSpan
+            A shared context manager which does nothing
+        """
+        return _NULL_SPAN
+
+    def record(self, name: str, duration: float) -> None:
+        """Does nothing"""
+
+    def turn(self) -> None:
+        """Does nothing"""
+
+    def room(self, room: str) -> "NullMetrics":
+        """
+        Parameters
+        ----------
+        room: str
+
+        Returns
+        -------
+        NullMetrics
+            The metrics themselves, as they record nothing
+        """
+        return self
+
+    def durations(self, name: str) -> typing.List[float]:
+        """
+        Parameters
+        ----------
+        name: str
+
+        Returns
+        -------
+        list[float]
+            An empty list
+        """
+        return []
+
+    def summary(self) -> str:
+        """
+        Returns
+        -------
+        str
+            An empty string
+        """
+        return ""
+
+    def close(self) -> None:
+        """Does nothing"""
+
+
+NULL_METRICS = NullMetrics()
+
+
+def _escape_label(value: str) -> str:
+    """Escapes a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _bucket_counts(durations: typing.Iterable[float]) -> typing.List[int]:
+    """Returns the number of durations in each bucket, the last one being +Inf"""
+    counts = [0] * (len(BUCKETS) + 1)
+    for duration in durations:
+        counts[bisect.bisect_left(BUCKETS, duration)] += 1
+    return counts
+
+
+class Metrics(NullMetrics):
+    """
+    Records timing spans around the phases of every turn
+
+    The games played concurrently should each record through their own view (see `Metrics.room`),
+    so that their turns are counted apart and their spans can be told apart.
+
+    Parameters
+    ----------
+    path: str | pathlib.Path, default = None
+        The JSON-lines file every span is appended to
+    port: int, default = None
+        The port to serve the Prometheus-style histograms on (at `/metrics`)
+    host: str, default = "127.0.0.1"
+        The host to serve the histograms on
+    """
+
+    enabled = True
+
+    def __init__(self, path: typing.Optional[typing.Union[str, pathlib.Path]] = None, port: typing.Optional[int] = None, host: str = "127.0.0.1") -> None:
+        self._lock = threading.Lock()
+        # by room (None when recorded from the metrics themselves) and phase
+        self._durations: typing.Dict[typing.Tuple[typing.Optional[str], str], typing.List[float]] = {}
+        self._turns: typing.Dict[typing.Optional[str], int] = {}
+        self._file = open(path, "a", encoding="utf-8") if path is not None else None
+
+        self._server = None
+        if port is not None:
+            self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            self._server.metrics = self
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def span(self, name: str) -> _Span:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+
+        Returns
+        -------
+        _Span
+            A context manager recording the time spent in its block
+        """
+        return _Span(self, name)
+
+    def record(self, name: str, duration: float, room: typing.Optional[str] = None) -> None:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+        duration: float
+            The time spent (in secs)
+        room: str, default = None
+            The room the span was recorded in
+        """
+        with self._lock:
+            self._durations.setdefault((room, name), []).append(duration)
+            if self._file is not None:
+                self._file.write(json.dumps({"time": time.time(), "room": room, "turn": self._turns.get(room, 0),
+                                             "span": name, "duration": duration}) + "\n")
+                self._file.flush()
+
+    def turn(self, room: typing.Optional[str] = None) -> None:
+        """
+        Marks the beginning of a new turn
+
+        Parameters
+        ----------
+        room: str, default = None
+            The room the turn is played in, which has its own turn counter
+        """
+        with self._lock:
+            self._turns[room] = self._turns.get(room, 0) + 1
+
+    def room(self, room: str) -> "RoomMetrics":
+        """
+        Parameters
+        ----------
+        room: str
+
+        Returns
+        -------
+        RoomMetrics
+            A view recording the spans and turns of the given room into these metrics
+        """
+        return RoomMetrics(self, room)
+
+    def durations(self, name: str, room: typing.Optional[str] = None) -> typing.List[float]:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+        room: str, default = None
+            The room to get the durations of. Every room is included when None.
+
+        Returns
+        -------
+        list[float]
+            The time spent in every recorded span of the phase (in secs)
+        """
+        with self._lock:
+            return [duration for (span_room, span), durations in self._durations.items()
+                    if span == name and (room is None or span_room == room) for duration in durations]
+
+    def histograms(self) -> typing.Dict[str, typing.List[int]]:
+        """
+        Returns
+        -------
+        dict[str, list[int]]
+            The number of durations in each bucket (the last one being +Inf) for every phase, every room included
+        """
+        with self._lock:
+            durations: typing.Dict[str, typing.List[float]] = {}
+            for (_, name), values in self._durations.items():
+                durations.setdefault(name, []).extend(values)
+        return {name: _bucket_counts(values) for name, values in durations.items()}
+
+    def prometheus(self) -> str:
+        """
+        Returns
+        -------
+        str
+            The histograms in the Prometheus text format
+        """
+        lines = ["# HELP jklmbot_span_seconds The time spent in each phase of a turn",
+                 "# TYPE jklmbot_span_seconds histogram"]
+        with self._lock:
+            series = {key: list(durations) for key, durations in self._durations.items()}
+        for (room, name), durations in series.items():
+            labels = f'span="{_escape_label(name)}"' + ("" if room is None else f',room="{_escape_label(room)}"')
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), _bucket_counts(durations)):
+                cumulative += count
+                label = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'jklmbot_span_seconds_bucket{{{labels},le="{label}"}} {cumulative}')
+            lines.append(f'jklmbot_span_seconds_sum{{{labels}}} {sum(durations)}')
+            lines.append(f'jklmbot_span_seconds_count{{{labels}}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        Returns
+        -------
+        str
+            A human readable histogram of every phase
+        """
+        lines = []
+        histograms = self.histograms()
+        for name, counts in histograms.items():
+            values = sorted(self.durations(name))
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            lines.append(f"⏱️ {name}: {len(values)} spans, mean {sum(values) / len(values) * 1000:.2f} ms, "
+                         f"p50 {values[len(values) // 2] * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms")
+            largest = max(counts)
+            for bound, count in zip(BUCKETS + (float("inf"),), counts):
+                if count:
+                    label = "+Inf" if bound == float("inf") else f"{bound * 1000:g} ms"
+                    lines.append(f"   ≤ {label:>9} {'█' * max(1, round(count / largest * 30))} {count}")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Stops serving the histograms and closes the JSON-lines file"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class RoomMetrics(NullMetrics):
+    """
+    The view of a `Metrics` recording the spans and turns of a single room
+
+    Parameters
+    ----------
+    metrics: Metrics
+        The metrics every span is recorded into
+    room: str
+        The room code
+    """
+
+    enabled = True
+
+    def __init__(self, metrics: Metrics, room: str) -> None:
+        self.metrics = metrics
+        self.code = str(room)
+
+    def span(self, name: str) -> _Span:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+
+        Returns
+        -------
+        _Span
+            A context manager recording the time spent in its block
+        """
+        return _Span(self, name)
+
+    def record(self, name: str, duration: float) -> None:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+        duration: float
+            The time spent (in secs)
+        """
+        self.metrics.record(name, duration, room=self.code)
+
+    def turn(self) -> None:
+        """Marks the beginning of a new turn in the room"""
+        self.metrics.turn(room=self.code)
+
+    def room(self, room: str) -> "RoomMetrics":
+        """
+        Parameters
+        ----------
+        room: str
+
+        Returns
+        -------
+        RoomMetrics
+            A view of the shared metrics for the given room
+        """
+        return self.metrics.room(room)
+
+    def durations(self, name: str) -> typing.List[float]:
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the phase
+
+        Returns
+        -------
+        list[float]
+            The time spent in every recorded span of the phase in the room (in secs)
+        """
+        return self.metrics.durations(name, room=self.code)
+
+    def __repr__(self) -> str:
+        return f"RoomMetrics(room={self.code!r})"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = self.server.metrics.prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,306 @@
+"""ranks the candidates of a syllable"""
+import array
+import heapq
+import math
+import typing
+
+from jklmbot.index import SyllableIndex
+
+_NUMPY: typing.Any = False
+
+DEFAULT_BONUS_ALPHABET = "abcdefghijlmnopqrstuv"
+"""The letters to type to get a bonus life in the default BombParty rules"""
+
+BONUS_LETTER_WEIGHT = 4
+"""The number of characters a missing bonus letter is worth typing, with the `bonus` strategy"""
+
+STRATEGIES = ("first", "shortest", "bonus", "common")
+"""
+The ways to rank the candidates:
+
+- `first`: in the order of the source word list (the most frequent words first, for the lists sorted by frequency)
+- `shortest`: the shortest words first
+- `bonus`: the words with the most letters missing for the bonus life first (see `BONUS_LETTER_WEIGHT`)
+- `common`: the words made of the most common letter sequences first
+
+The ties are broken by the order of the source word list, as the rarest words are the most likely to be rejected by the game.
+Only `first` always picks the most frequent word: the other strategies trade some of the frequency for their own goal.
+"""
+
+
+def _numpy() -> typing.Any:
+    """Returns the numpy module, or None when it is not installed (it is only imported once a ranking needs it)"""
+    global _NUMPY
+    if _NUMPY is False:
+        try:
+            import numpy
+        except ImportError:  # numpy is an optional speedup
+            numpy = None
+        _NUMPY = numpy
+    return _NUMPY
+
+
+def letter_mask(word: str, alphabet: str = DEFAULT_BONUS_ALPHABET) -> int:
+    """
+    Returns the bitmask of the alphabet letters used by the given word
+
+    Parameters
+    ----------
+    word: str
+    alphabet: str, default = DEFAULT_BONUS_ALPHABET
+
+    Returns
+    -------
+    int
+    """
+    mask = 0
+    for letter in set(word):
+        position = alphabet.find(letter)
+        if position >= 0:
+            mask |= 1 << position
+    return mask
+
+
+class WordFeatures:
+    """
+    The features used to rank the words of an indexed dictionary
+
+    Every feature is stored in an array aligned with the dictionary.
+
+    Parameters
+    ----------
+    index: SyllableIndex
+        The index of the dictionary
+    alphabet: str, default = DEFAULT_BONUS_ALPHABET
+        The bonus letters
+    ranks: Sequence[int], default = None
+        The position of each word in the source word list. Defaults to the dictionary order.
+
+    Attributes
+    ----------
+    lengths: array.array
+        The number of characters of each word
+    letters: array.array
+        The bitmask of the bonus letters used by each word (see `letter_mask`)
+    rarity: array.array
+        The average rarity of the 3-letter sequences of each word (the log of the
+        inverse of the fraction of words containing them)
+    ranks: array.array
+        The position of each word in the source word list
+    """
+
+    def __init__(self, index: SyllableIndex, alphabet: str = DEFAULT_BONUS_ALPHABET, ranks: typing.Optional[typing.Iterable[int]] = None) -> None:
+        self.alphabet = str(alphabet)
+        self.full_mask = (1 << len(self.alphabet)) - 1
+        bits = {letter: 1 << position for position, letter in enumerate(self.alphabet)}
+        total = max(len(index.dictionary), 1)
+        weights: typing.Dict[str, float] = {}
+
+        self.lengths = array.array("H")
+        self.letters = array.array("I")
+        self.rarity = array.array("f")
+        for word in index.dictionary:
+            self.lengths.append(min(len(word), 0xFFFF))
+
+            mask = 0
+            for letter in set(word):
+                mask |= bits.get(letter, 0)
+            self.letters.append(mask)
+
+            sequences = {word[start:start + 3] for start in range(len(word) - 2)} or {word}
+            score = 0.0
+            for sequence in sequences:
+                try:
+                    score += weights[sequence]
+                except KeyError:
+                    weight = weights[sequence] = math.log(total / max(len(index.positions(sequence)), 1))
+                    score += weight
+            self.rarity.append(score / len(sequences))
+
+        self.ranks = array.array("I", range(len(index.dictionary)) if ranks is None else ranks)
+        if len(self.ranks) != len(index.dictionary):
+            raise ValueError(f"❌ Got {len(self.ranks)} ranks for {len(index.dictionary)} words")
+        self._arrays = None
+
+    @classmethod
+    def from_arrays(cls, alphabet: str, lengths: typing.Sequence[int], letters: typing.Sequence[int], rarity: typing.Sequence[float],
+                    ranks: typing.Sequence[int]) -> "WordFeatures":
+        """
+        Creates the features from already computed arrays
+
+        Parameters
+        ----------
+        alphabet: str
+            The bonus letters used to compute `letters`
+        lengths: Sequence[int]
+            16-bit unsigned integers supporting the buffer protocol
+        letters: Sequence[int]
+            32-bit unsigned integers supporting the buffer protocol
+        rarity: Sequence[float]
+            32-bit floats supporting the buffer protocol
+        ranks: Sequence[int]
+            32-bit unsigned integers supporting the buffer protocol
+
+        Returns
+        -------
+        WordFeatures
+        """
+        features = cls.__new__(cls)
+        features.alphabet = str(alphabet)
+        features.full_mask = (1 << len(features.alphabet)) - 1
+        features.lengths = lengths
+        features.letters = letters
+        features.rarity = rarity
+        features.ranks = ranks
+        features._arrays = None
+        return features
+
+    def arrays(self) -> typing.Tuple[typing.Any, typing.Any, typing.Any, typing.Any]:
+        """
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The lengths, letters, rarity and ranks as numpy arrays sharing the features memory
+        """
+        if self._arrays is None:
+            numpy = _numpy()
+            self._arrays = (numpy.frombuffer(self.lengths, dtype=numpy.uint16),
+                            numpy.frombuffer(self.letters, dtype=numpy.uint32),
+                            numpy.frombuffer(self.rarity, dtype=numpy.float32),
+                            numpy.frombuffer(self.ranks, dtype=numpy.uint32))
+        return self._arrays
+
+
+def _popcount(values: typing.Any) -> typing.Any:
+    """Counts the bits set in each value of the given uint32 numpy array"""
+    numpy = _numpy()
+    if hasattr(numpy, "bitwise_count"):
+        return numpy.bitwise_count(values)
+    return numpy.unpackbits(values.view(numpy.uint8)).reshape(-1, 32).sum(axis=1)
+
+
+def _numpy_keys(features: WordFeatures, positions: typing.Any, strategy: str, covered: int) -> typing.Any:
+    """Returns the ranking keys of the given positions, the lowest being the best (the ties being broken by `features.ranks`)"""
+    numpy = _numpy()
+    lengths, letters, rarity, ranks = features.arrays()
+    if strategy == "first":
+        return ranks[positions]
+    if strategy == "shortest":
+        return lengths[positions]
+    if strategy == "bonus":
+        uncovered = numpy.uint32(features.full_mask & ~covered)
+        return lengths[positions].astype(numpy.int64) - BONUS_LETTER_WEIGHT * _popcount(letters[positions] & uncovered).astype(numpy.int64)
+    return rarity[positions]
+
+
+def _python_key(features: WordFeatures, strategy: str, covered: int) -> typing.Callable[[int], typing.Any]:
+    """Returns the function giving the ranking key of a position, the lowest being the best"""
+    ranks = features.ranks
+    if strategy == "first":
+        return ranks.__getitem__
+    if strategy == "shortest":
+        lengths = features.lengths
+        return lambda position: (lengths[position], ranks[position])
+    if strategy == "bonus":
+        lengths, letters = features.lengths, features.letters
+        uncovered = features.full_mask & ~covered
+        return lambda position: (lengths[position] - BONUS_LETTER_WEIGHT * bin(letters[position] & uncovered).count("1"), ranks[position])
+    rarity = features.rarity
+    return lambda position: (rarity[position], ranks[position])
+
+
+def rank_candidates(index: SyllableIndex, features: WordFeatures, syllable: str, k: int = 10, strategy: str = "first",
+                    exclude: typing.Container[str] = (), covered: int = 0) -> typing.List[str]:
+    """
+    Returns the best `k` words containing the given syllable
+
+    Parameters
+    ----------
+    index: SyllableIndex
+    features: WordFeatures
+        The features of the indexed dictionary
+    syllable: str
+    k: int, default = 10
+        The maximum number of words to return
+    strategy: str, default = "first"
+        How to rank the words (see `STRATEGIES`)
+    exclude: Container[str], default = ()
+        The words which can't be played
+    covered: int, default = 0
+        The bitmask of the bonus letters already typed, used by the `bonus` strategy
+
+    Returns
+    -------
+    list[str]
+        The words, best first
+
+    Raises
+    ------
+    ValueError
+        When the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"❌ Unknown ranking strategy '{strategy}' (expected one of {', '.join(STRATEGIES)})")
+
+    syllable = str(syllable).lower()
+    dictionary = index.dictionary
+    positions = index.positions(syllable)
+    if len(syllable) > index.max_length:
+        positions = array.array("I", (position for position in positions if syllable in dictionary[position]))
+
+    # enough words to still have `k` of them once the excluded ones are removed
+    wanted = min(k + len(exclude) if hasattr(exclude, "__len__") else len(positions), len(positions))
+    numpy = _numpy()
+    if numpy is not None:
+        # the positions might be 16 or 32-bit integers
+        candidates = numpy.asarray(positions)
+        keys = _numpy_keys(features, candidates, strategy, covered)
+        best = numpy.arange(len(candidates))
+        if 0 < wanted < len(candidates):
+            # keeps every word tied with the worst wanted one so that the ties can be broken by rank
+            threshold = keys[numpy.argpartition(keys, wanted - 1)[wanted - 1]]
+            best = numpy.flatnonzero(keys <= threshold)
+        best = best[numpy.lexsort((features.arrays()[3][candidates[best]], keys[best]))][:wanted]
+        ordered: typing.Iterable[int] = candidates[best].tolist()
+    else:
+        ordered = heapq.nsmallest(wanted, positions, key=_python_key(features, strategy, covered))
+
+    results = []
+    for position in ordered:
+        word = dictionary[position]
+        if word not in exclude:
+            results.append(word)
+            if len(results) >= k:
+                break
+    return results
+
+
+def ranked_candidates(index: SyllableIndex, features: WordFeatures, syllable: str, k: int = 10, strategy: str = "first",
+                      exclude: typing.Container[str] = (), covered: int = 0) -> typing.Iterator[str]:
+    """
+    Iterates over the best `k` words containing the given syllable, then over every other one in the source word list order
+
+    The words coming after the best ones might repeat them or be excluded.
+
+    Parameters
+    ----------
+    index: SyllableIndex
+    features: WordFeatures
+        The features of the indexed dictionary
+    syllable: str
+    k: int, default = 10
+        The number of ranked words
+    strategy: str, default = "first"
+        How to rank the words (see `STRATEGIES`)
+    exclude: Container[str], default = ()
+        The words which can't be played
+    covered: int, default = 0
+        The bitmask of the bonus letters already typed, used by the `bonus` strategy
+
+    Returns
+    -------
+    Iterator[str]
+    """
+    yield from rank_candidates(index, features, syllable, k=k, strategy=strategy, exclude=exclude, covered=covered)
+    # only ranked once the best words have all been rejected
+    yield from rank_candidates(index, features, syllable, k=len(index.positions(syllable)), strategy="first")
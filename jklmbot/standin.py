@@ -0,0 +1,273 @@
+"""a local stand-in for the BombParty rooms, to measure the bot without going to jklm.fun"""
+import argparse
+import html
+import json
+import threading
+import typing
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_SYLLABLES = ("ing", "er", "tion", "an", "re", "on", "st", "ou", "ch", "le", "ent", "ar", "al", "ed", "es")
+
+ROOM_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>BombParty stand-in</title></head>
+<body>
+    <div class="nickname">
+        <input type="text" placeholder="Your name">
+        <button class="styled" onclick="this.parentElement.style.display = 'none'">OK</button>
+    </div>
+    <iframe src="/game?room=%(room)s" width="800" height="600"></iframe>
+</body>
+</html>"""
+
+GAME_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>BombParty stand-in game</title></head>
+<body>
+    <div class="dictionary">%(language)s</div>
+    <div class="syllable"></div>
+    <button class="joinRound">Join game</button>
+    <div class="selfTurn" style="display: none">
+        <form><input type="text" autocomplete="off"></form>
+    </div>
+    <script>
+        const CONFIG = %(config)s;
+        const selfPeerId = 0;
+        const socket = {
+            handlers: {},
+            on(event, handler) { (this.handlers[event] = this.handlers[event] || []).push(handler); },
+            emit(event, ...args) { (this.handlers[event] || []).forEach((handler) => handler(...args)); },
+        };
+
+        const syllableElement = document.querySelector(".syllable");
+        const joinButton = document.querySelector(".joinRound");
+        const selfTurn = document.querySelector(".selfTurn");
+        const form = selfTurn.querySelector("form");
+        const input = selfTurn.querySelector("input");
+
+        const results = [];
+        const usedWords = new Set();
+        let turn = null;
+
+        const report = () => fetch("/results?room=" + encodeURIComponent(CONFIG.room), { method: "POST", body: JSON.stringify(results) });
+
+        const endTurn = (outcome) => {
+            clearTimeout(turn.timer);
+            results.push(Object.assign({ syllable: turn.syllable, attempts: turn.attempts, outcome: outcome }, turn.timings));
+            selfTurn.style.display = "none";
+            turn = null;
+            if (results.length >= CONFIG.turns) {
+                syllableElement.textContent = "";
+                report();
+                return;
+            }
+            // lets the "other players" play before the next turn
+            setTimeout(startTurn, CONFIG.otherTurnDuration);
+        };
+
+        const startTurn = () => {
+            const syllable = CONFIG.syllables[results.length %% CONFIG.syllables.length];
+            syllableElement.textContent = syllable;
+            input.value = "";
+            selfTurn.style.display = "";
+            turn = { syllable: syllable, attempts: 0, timings: {}, shownAt: performance.now() };
+            turn.timer = setTimeout(() => endTurn("exploded"), CONFIG.turnDuration);
+        };
+
+        form.addEventListener("submit", (event) => {
+            event.preventDefault();
+            if (turn === null) {
+                return;
+            }
+            const word = input.value.trim().toLowerCase();
+            const elapsed = performance.now() - turn.shownAt;
+            turn.attempts += 1;
+            if (turn.timings.firstSubmit === undefined) {
+                turn.timings.firstSubmit = elapsed;
+            }
+            input.value = "";
+            if (word.includes(turn.syllable) && !usedWords.has(word)) {
+                usedWords.add(word);
+                turn.timings.submit = elapsed;
+                turn.timings.word = word;
+                socket.emit("correctWord", { playerPeerId: selfPeerId, bonusLetters: [] });
+                endTurn("accepted");
+            } else {
+                socket.emit("failWord", selfPeerId, usedWords.has(word) ? "alreadyUsed" : "notInDictionary");
+            }
+        });
+
+        joinButton.addEventListener("click", () => {
+            joinButton.style.display = "none";
+            setTimeout(startTurn, CONFIG.startDelay);
+        });
+    </script>
+</body>
+</html>"""
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Serves BombParty-like rooms playing a scripted sequence of turns
+
+    Each room page embeds the game iframe with the elements the bot relies on
+    (`.syllable`, `.dictionary`, the "Join game" button and the textbox).
+    Once joined, the game gives the bot `turns` turns using the given syllables and
+    reports the timings of every turn, which can be retrieved with `results`.
+
+    Parameters
+    ----------
+    host: str, default = "127.0.0.1"
+    port: int, default = 0
+        The port to listen on. A free port is picked when 0.
+    language: str, default = "English"
+        The text of the `.dictionary` element
+    syllables: Iterable[str], default = DEFAULT_SYLLABLES
+        The syllables to give, in order
+    turns: int, default = 10
+        The number of turns to play before stopping
+    turn_duration: float, default = 10
+        The time before the bomb explodes (in secs)
+    other_turn_duration: float, default = 0.2
+        The time between two turns of the bot (in secs)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, language: str = "English",
+                 syllables: typing.Iterable[str] = DEFAULT_SYLLABLES, turns: int = 10,
+                 turn_duration: float = 10, other_turn_duration: float = 0.2) -> None:
+        super().__init__((host, port), _StandInHandler)
+        self.language = str(language)
+        self.syllables = [str(syllable).lower() for syllable in syllables]
+        self.turns = int(turns)
+        self.turn_duration = float(turn_duration)
+        self.other_turn_duration = float(other_turn_duration)
+        self._results: typing.Dict[str, typing.List[dict]] = {}
+        self._finished = threading.Condition()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def game_config(self, room: str) -> dict:
+        """
+        Returns the configuration given to the game iframe of the given room
+
+        Parameters
+        ----------
+        room: str
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            "room": room,
+            "syllables": self.syllables,
+            "turns": self.turns,
+            "turnDuration": self.turn_duration * 1000,
+            "otherTurnDuration": self.other_turn_duration * 1000,
+            "startDelay": 500,
+        }
+
+    def add_results(self, room: str, results: typing.List[dict]) -> None:
+        """
+        Stores the results reported by the game of the given room
+
+        Parameters
+        ----------
+        room: str
+        results: list[dict]
+        """
+        with self._finished:
+            self._results[room] = results
+            self._finished.notify_all()
+
+    def results(self, room: str, timeout: typing.Optional[float] = None) -> typing.Optional[typing.List[dict]]:
+        """
+        Waits for the game of the given room to finish and returns its turns
+
+        Parameters
+        ----------
+        room: str
+        timeout: float, default = None
+            The maximum time to wait (in secs). Waits forever when None.
+
+        Returns
+        -------
+        list[dict] | None
+            The turns played (`syllable`, `attempts`, `outcome` and, in ms since the syllable was shown,
+            `firstSubmit` and `submit`), or None if the game didn't finish in time
+        """
+        with self._finished:
+            self._finished.wait_for(lambda: room in self._results, timeout=timeout)
+            return self._results.get(room)
+
+    def start(self) -> "StandInServer":
+        """Serves the rooms from a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def log_message(self, format: str, *args: typing.Any) -> None:
+        pass
+
+    def _send(self, body: str, content_type: str = "text/html; charset=utf-8", status: int = 200) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        room = query.get("room", [""])[0]
+        if url.path == "/game":
+            # `</` can't appear in the inline script
+            config = json.dumps(self.server.game_config(room)).replace("</", "<\\/")
+            self._send(GAME_PAGE % {"language": html.escape(self.server.language), "config": config})
+        elif url.path == "/results":
+            self._send(json.dumps(self.server.results(room, timeout=0)), content_type="application/json")
+        elif url.path.strip("/") and "/" not in url.path.strip("/"):
+            self._send(ROOM_PAGE % {"room": urllib.parse.quote(url.path.strip("/"))})
+        else:
+            self._send("Not Found", content_type="text/plain", status=404)
+
+    def do_POST(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/results":
+            self._send("Not Found", content_type="text/plain", status=404)
+            return
+        room = urllib.parse.parse_qs(url.query).get("room", [""])[0]
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.add_results(room, json.loads(self.rfile.read(length) or b"[]"))
+        self._send("{}", content_type="application/json")
+
+
+def entry():
+    """the main entrypoint"""
+    parser = argparse.ArgumentParser(prog='jklmbot.standin', description='Serve local BombParty stand-in rooms')
+    parser.add_argument("--host", action="store", type=str, default="127.0.0.1", help="The host to listen on.")
+    parser.add_argument("--port", action="store", type=int, default=8080, help="The port to listen on.")
+    parser.add_argument("--language", action="store", type=str, default="English", help="The dictionary shown to the bot.")
+    parser.add_argument("--syllables", action="store", nargs="+", type=str, default=DEFAULT_SYLLABLES, help="The syllables to give, in order.")
+    parser.add_argument("--turns", action="store", type=int, default=10, help="The number of turns to play.")
+    args = parser.parse_args()
+
+    server = StandInServer(host=args.host, port=args.port, language=args.language, syllables=args.syllables, turns=args.turns)
+    print(f"🎮 Serving the stand-in rooms on {server.url} (run jklmbot --base-url {server.url} --room <ANY>)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    entry()
@@ -0,0 +1,512 @@
+"""the per-session game state"""
+import asyncio
+import time
+import typing
+
+from playwright.async_api import Frame as AsyncFrame
+from playwright.async_api import FrameLocator as AsyncFrameLocator
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Frame, FrameLocator, Page
+
+from jklmbot.events import JOIN_TIMEOUT, AsyncGameEvents, GameEvents
+from jklmbot.languages import REGISTRY, SUPPORTED_LANGUAGES, Language, LanguageRegistry, resolve_language
+from jklmbot.metrics import NULL_METRICS, NullMetrics
+from jklmbot.ranking import letter_mask, ranked_candidates
+from jklmbot.submit import AsyncSubmitter, Submitter
+from jklmbot.tracker import AsyncUsedWords, UsedWords
+
+ANSWER_EVENTS = ("answer", "turn")
+"""The events telling if a submitted answer was checked"""
+
+
+def answer_accepted(event: typing.Optional[typing.Tuple[str, typing.Any]], game: typing.Dict[str, typing.Any]) -> bool:
+    """
+    Tells, in the event-driven mode, if the submitted answer was accepted
+
+    Parameters
+    ----------
+    event: tuple[str, Any] | None
+        The first of the `ANSWER_EVENTS` received after submitting the answer, None if none came in time
+    game: dict
+        The game state pushed by the game iframe
+
+    Returns
+    -------
+    bool
+    """
+    if event is not None and event[0] == "answer" and event[1]["accepted"]:
+        return True
+    # the turn ended, which only happens once the answer is accepted (or the bomb exploded)
+    return not game["turn"]
+
+
+class Turn:
+    """
+    The words tried during a turn of the bot
+
+    Parameters
+    ----------
+    state: GameState | AsyncGameState
+        The state of the game session
+    language: Language
+        The language of the current round
+    syllable: str
+        The syllable to find a word for
+    strategy: str, default = "first"
+        How to rank the candidates (see `jklmbot.ranking.STRATEGIES`)
+    """
+
+    def __init__(self, state: "_BaseGameState", language: Language, syllable: str, strategy: str = "first") -> None:
+        self.state = state
+        self.language = language
+        self.strategy = strategy
+        self.syllable = syllable
+        self._candidates = state.candidates(language, syllable, strategy)
+
+    def next_word(self) -> typing.Optional[str]:
+        """
+        Returns
+        -------
+        str | None
+            The best word which hasn't been used yet, or None if every candidate has been tried
+        """
+        used_words = self.state.used_words
+        return next((word for word in self._candidates if word not in used_words), None)
+
+    def submitted(self, word: str) -> None:
+        """
+        Records a word submitted by the bot, whatever the outcome
+
+        Parameters
+        ----------
+        word: str
+        """
+        self.state.used_words.add(word)
+
+    def rejected(self, syllable: str) -> None:
+        """
+        Records that the last submitted word was rejected
+
+        Parameters
+        ----------
+        syllable: str
+            The syllable shown after the rejection. The candidates are searched again when it changed.
+        """
+        if syllable != self.syllable:
+            # the candidates only match the previous syllable
+            self.syllable = syllable
+            self._candidates = self.state.candidates(self.language, syllable, self.strategy)
+
+
+class _BaseGameState:
+    """
+    Caches what only changes between rounds
+
+    Parameters
+    ----------
+    used_words: UsedWords
+        The words which can't be played anymore
+    events: GameEvents | AsyncGameEvents, default = None
+        The events pushed by the game iframe, in the event-driven mode
+    registry: LanguageRegistry, default = REGISTRY
+        The registry to load the languages from
+    """
+
+    def __init__(self, used_words: UsedWords, events: typing.Optional[typing.Union[GameEvents, AsyncGameEvents]] = None, registry: LanguageRegistry = REGISTRY) -> None:
+        self.registry = registry
+        self.used_words = used_words
+        self.events = events
+        self.covered_letters = 0
+        self._dictionary_text: typing.Optional[str] = None
+        self._language: typing.Optional[Language] = None
+        self._warned_unhooked = False
+
+    def _warn_if_unhooked(self) -> None:
+        """Warns once when the event-driven mode doesn't receive the answers, a rejected word then taking `check_delay` to be noticed"""
+        if self.events is not None and not self.events.hooked and not self._warned_unhooked:
+            print("⚠️ The game socket isn't hooked yet: the rejected words are only noticed after the check delay")
+            self._warned_unhooked = True
+
+    def _cached_language(self, dictionary_text: typing.Optional[str]) -> typing.Optional[Language]:
+        """Returns the cached language if it is still valid for the given `.dictionary` text (None meaning unknown)"""
+        if self._language is None:
+            return None
+        if dictionary_text is not None and dictionary_text != self._dictionary_text:
+            return None
+        return self._language
+
+    def _cache_language(self, dictionary_text: str, language: Language) -> Language:
+        if self._language is None or self._language.name != language.name:
+            print(f"🧃 Found the {SUPPORTED_LANGUAGES[language.name]} dictionary")
+        self._dictionary_text = dictionary_text
+        self._language = language
+        return language
+
+    def _pushed_dictionary_text(self) -> typing.Optional[str]:
+        """Returns the `.dictionary` text pushed in the event-driven mode (None if it has to be read from the page)"""
+        if self.events is None or self.events.state["dictionary"] is None:
+            return None
+        return str(self.events.state["dictionary"])
+
+    def candidates(self, language: Language, syllable: str, strategy: str = "first", k: int = 10) -> typing.Iterator[str]:
+        """
+        Iterates over the words to try for the given syllable, best first
+
+        Parameters
+        ----------
+        language: Language
+        syllable: str
+        strategy: str, default = "first"
+            How to rank the words (see `jklmbot.ranking.STRATEGIES`)
+        k: int, default = 10
+            The number of ranked words, the other ones coming in the source word list order
+
+        Returns
+        -------
+        Iterator[str]
+            The words, which might include some already used
+        """
+        return ranked_candidates(language.index, language.features, syllable, k=k, strategy=strategy,
+                                 exclude=self.used_words, covered=self.covered_letters)
+
+    def turn(self, language: Language, syllable: str, strategy: str = "first") -> Turn:
+        """
+        Parameters
+        ----------
+        language: Language
+        syllable: str
+        strategy: str, default = "first"
+            How to rank the candidates (see `jklmbot.ranking.STRATEGIES`)
+
+        Returns
+        -------
+        Turn
+            The words to try for the given syllable
+        """
+        return Turn(self, language, syllable, strategy)
+
+    def played(self, word: str) -> None:
+        """
+        Records a word accepted from the bot
+
+        Parameters
+        ----------
+        word: str
+        """
+        if self._language is None:
+            return
+        features = self._language.features
+        self.covered_letters |= letter_mask(word, features.alphabet)
+        if self.covered_letters == features.full_mask:
+            # every bonus letter has been typed and a life was gained
+            self.covered_letters = 0
+
+    def new_round(self) -> None:
+        """Forgets everything cached for the previous round"""
+        self.used_words.reset()
+        self.covered_letters = 0
+        self._dictionary_text = None
+        self._language = None
+
+
+class GameState(_BaseGameState):
+    """
+    The state of a game session, caching the game iframe locators and the room language
+
+    The language is only read again when a new round starts or, in the event-driven mode,
+    when the `.dictionary` text changes.
+
+    Parameters
+    ----------
+    page: Page
+        The page the game is played on
+    events: GameEvents, default = None
+        The events pushed by the game iframe, in the event-driven mode
+    track_others: bool, default = False
+        If the words played by the other players should be avoided too
+    registry: LanguageRegistry, default = REGISTRY
+        The registry to load the languages from
+    """
+
+    def __init__(self, page: Page, events: typing.Optional[GameEvents] = None, track_others: bool = False, registry: LanguageRegistry = REGISTRY) -> None:
+        super().__init__(UsedWords(track_others=track_others), events=events, registry=registry)
+        self.page = page
+        self.frame: FrameLocator = page.frame_locator("iframe >> nth=0")
+        self.textbox = self.frame.get_by_role("textbox")
+        self.join_button = self.frame.get_by_role("button", name="Join game")
+
+    @property
+    def game_frame(self) -> Frame:
+        """The game iframe"""
+        return self.page.main_frame.child_frames[0]
+
+    def new_round(self) -> None:
+        """Forgets everything cached for the previous round and loads the language of the new one"""
+        super().new_round()
+        self.used_words.hook(self.game_frame)
+        # loading a dictionary takes a while, which is better done before the turn starts
+        self.language()
+
+    def join(self) -> None:
+        """Clicks "Join game" until it works or the bot's turn already started"""
+        print("Joining game")
+        JOINED = False
+        while not JOINED:
+            try:
+                self.join_button.click(timeout=1000)
+                JOINED = True
+            except Exception:
+                JOINED = self.textbox.is_visible()
+
+    def wait_for_turn(self) -> None:
+        """Waits for the bot's turn, joining the next round whenever possible"""
+        while True:
+            if self.events is not None:
+                self.events.wait_until(lambda game: game["turn"] or game["joinable"])
+                if self.events.state["turn"]:
+                    return
+                self.join()
+                # the pushed state might still show the button, which would make us join again
+                self.events.wait_until(lambda game: game["turn"] or not game["joinable"], timeout=JOIN_TIMEOUT)
+                self.new_round()
+                continue
+            try:
+                self.textbox.wait_for(state="visible", timeout=1000)
+                return
+            except Exception:
+                if self.join_button.is_visible():
+                    self.join()
+                    self.new_round()
+
+    def syllable(self) -> str:
+        """
+        Returns
+        -------
+        str
+            The current syllable
+        """
+        if self.events is not None:
+            syllable = str(self.events.state["syllable"]).lower()
+        else:
+            syllable = str(self.frame.locator(".syllable").text_content()).lower()
+        print(f"🧃 The syllable is '{syllable}'")
+        return syllable
+
+    def language(self) -> Language:
+        """
+        Returns
+        -------
+        Language
+            The language of the current round, with its dictionary and index
+        """
+        dictionary_text = self._pushed_dictionary_text()
+        cached = self._cached_language(dictionary_text)
+        if cached is not None:
+            return cached
+
+        print("🌐 Searching for the right dictionary...")
+        if dictionary_text is None:
+            dictionary_text = str(self.frame.locator(".dictionary").text_content())
+        return self._cache_language(dictionary_text, self.registry.get(resolve_language(dictionary_text)))
+
+    def sync_used_words(self) -> None:
+        """Records the words played by the other players since the last call"""
+        self.used_words.sync(self.game_frame)
+
+    def answer(self, turn: Turn, word: str, submitter: Submitter, check_delay: float = 1, metrics: NullMetrics = NULL_METRICS) -> bool:
+        """
+        Submits a word and waits for it to be checked
+
+        Parameters
+        ----------
+        turn: Turn
+            The current turn
+        word: str
+            The word to submit
+        submitter: Submitter
+            Types the word
+        check_delay: float, default = 1
+            The time to wait before checking the answer. In the event-driven mode, the maximum time to wait for it to be checked.
+        metrics: Metrics, default = NULL_METRICS
+            Records the time spent submitting and verifying the answer
+
+        Returns
+        -------
+        bool
+            If the word was accepted
+        """
+        if self.events is not None:
+            self._warn_if_unhooked()
+            self.events.clear()
+        with metrics.span("submit"):
+            submitter.submit(self.textbox, word)
+        print("Pressed [Enter]")
+        turn.submitted(word)
+        with metrics.span("verify"):
+            if self.events is not None:
+                # `check_delay` only bounds the wait as the answer is pushed as soon as it is known
+                accepted = answer_accepted(self.events.next(ANSWER_EVENTS, timeout=check_delay), self.events.state)
+                if accepted:
+                    # waits for the turn to really end before looking for the next one
+                    self.events.wait_until(lambda game: not game["turn"], timeout=check_delay)
+            else:
+                time.sleep(check_delay)
+                accepted = not self.textbox.is_visible()
+            if accepted:
+                self.played(word)
+                return True
+            turn.rejected(self.syllable())
+        return False
+
+
+class AsyncGameState(_BaseGameState):
+    """
+    The `asyncio` counterpart of `GameState`
+
+    Parameters
+    ----------
+    page: playwright.async_api.Page
+        The page the game is played on
+    events: AsyncGameEvents, default = None
+        The events pushed by the game iframe, in the event-driven mode
+    track_others: bool, default = False
+        If the words played by the other players should be avoided too
+    registry: LanguageRegistry, default = REGISTRY
+        The registry to load the languages from
+    """
+
+    used_words: AsyncUsedWords
+
+    def __init__(self, page: AsyncPage, events: typing.Optional[AsyncGameEvents] = None, track_others: bool = False, registry: LanguageRegistry = REGISTRY) -> None:
+        super().__init__(AsyncUsedWords(track_others=track_others), events=events, registry=registry)
+        self.page = page
+        self.frame: AsyncFrameLocator = page.frame_locator("iframe >> nth=0")
+        self.textbox = self.frame.get_by_role("textbox")
+        self.join_button = self.frame.get_by_role("button", name="Join game")
+
+    @property
+    def game_frame(self) -> AsyncFrame:
+        """The game iframe"""
+        return self.page.main_frame.child_frames[0]
+
+    async def new_round(self) -> None:
+        """Forgets everything cached for the previous round and loads the language of the new one"""
+        super().new_round()
+        await self.used_words.hook(self.game_frame)
+        # loading a dictionary takes a while, which is better done before the turn starts
+        await self.language()
+
+    async def join(self) -> None:
+        """Clicks "Join game" until it works or the bot's turn already started"""
+        print("Joining game")
+        JOINED = False
+        while not JOINED:
+            try:
+                await self.join_button.click(timeout=1000)
+                JOINED = True
+            except Exception:
+                JOINED = await self.textbox.is_visible()
+
+    async def wait_for_turn(self) -> None:
+        """Waits for the bot's turn, joining the next round whenever possible"""
+        while True:
+            if self.events is not None:
+                await self.events.wait_until(lambda game: game["turn"] or game["joinable"])
+                if self.events.state["turn"]:
+                    return
+                await self.join()
+                # the pushed state might still show the button, which would make us join again
+                await self.events.wait_until(lambda game: game["turn"] or not game["joinable"], timeout=JOIN_TIMEOUT)
+                await self.new_round()
+                continue
+            try:
+                await self.textbox.wait_for(state="visible", timeout=1000)
+                return
+            except Exception:
+                if await self.join_button.is_visible():
+                    await self.join()
+                    await self.new_round()
+
+    async def syllable(self) -> str:
+        """
+        Returns
+        -------
+        str
+            The current syllable
+        """
+        if self.events is not None:
+            syllable = str(self.events.state["syllable"]).lower()
+        else:
+            syllable = str(await self.frame.locator(".syllable").text_content()).lower()
+        print(f"🧃 The syllable is '{syllable}'")
+        return syllable
+
+    async def language(self) -> Language:
+        """
+        Returns
+        -------
+        Language
+            The language of the current round, with its dictionary and index
+        """
+        dictionary_text = self._pushed_dictionary_text()
+        cached = self._cached_language(dictionary_text)
+        if cached is not None:
+            return cached
+
+        print("🌐 Searching for the right dictionary...")
+        if dictionary_text is None:
+            dictionary_text = str(await self.frame.locator(".dictionary").text_content())
+        language = resolve_language(dictionary_text)
+        if language not in self.registry:
+            # loading a dictionary would block the other rooms
+            loaded = await asyncio.get_running_loop().run_in_executor(None, self.registry.get, language)
+        else:
+            loaded = self.registry.get(language)
+        return self._cache_language(dictionary_text, loaded)
+
+    async def sync_used_words(self) -> None:
+        """Records the words played by the other players since the last call"""
+        await self.used_words.sync(self.game_frame)
+
+    async def answer(self, turn: Turn, word: str, submitter: AsyncSubmitter, check_delay: float = 1, metrics: NullMetrics = NULL_METRICS) -> bool:
+        """
+        Submits a word and waits for it to be checked
+
+        Parameters
+        ----------
+        turn: Turn
+            The current turn
+        word: str
+            The word to submit
+        submitter: AsyncSubmitter
+            Types the word
+        check_delay: float, default = 1
+            The time to wait before checking the answer. In the event-driven mode, the maximum time to wait for it to be checked.
+        metrics: Metrics, default = NULL_METRICS
+            Records the time spent submitting and verifying the answer
+
+        Returns
+        -------
+        bool
+            If the word was accepted
+        """
+        if self.events is not None:
+            self._warn_if_unhooked()
+            self.events.clear()
+        with metrics.span("submit"):
+            await submitter.submit(self.textbox, word)
+        print("Pressed [Enter]")
+        turn.submitted(word)
+        with metrics.span("verify"):
+            if self.events is not None:
+                accepted = answer_accepted(await self.events.next(ANSWER_EVENTS, timeout=check_delay), self.events.state)
+                if accepted:
+                    await self.events.wait_until(lambda game: not game["turn"], timeout=check_delay)
+            else:
+                await asyncio.sleep(check_delay)
+                accepted = not await self.textbox.is_visible()
+            if accepted:
+                self.played(word)
+                return True
+            turn.rejected(await self.syllable())
+        return False
@@ -0,0 +1,203 @@
+"""types and submits the answers"""
+import asyncio
+import random
+import time
+import typing
+
+from playwright.async_api import Locator as AsyncLocator
+from playwright.sync_api import Locator
+
+TYPING_MODELS = ("constant", "gaussian", "zero")
+"""The names of the available typing models"""
+
+SUBMIT_MODES = ("keys", "script")
+"""How the answers are sent: one keypress at a time from Playwright, or all at once from a script evaluated in the game iframe"""
+
+SUBMIT_SCRIPT = """async (input, { word, delays }) => {
+    const sleep = (delay) => new Promise((resolve) => setTimeout(resolve, delay));
+    input.focus();
+    for (let i = 0; i < word.length; i++) {
+        input.value += word[i];
+        input.dispatchEvent(new InputEvent("input", { bubbles: true, data: word[i], inputType: "insertText" }));
+        if (delays[i] > 0) {
+            await sleep(delays[i]);
+        }
+    }
+    const enter = { key: "Enter", code: "Enter", keyCode: 13, which: 13, bubbles: true, cancelable: true };
+    if (!input.dispatchEvent(new KeyboardEvent("keydown", enter))) {
+        return;
+    }
+    if (input.form) {
+        input.form.requestSubmit();
+    }
+    input.dispatchEvent(new KeyboardEvent("keyup", enter));
+}"""
+"""Types the word into the input, waiting the given delays (in ms) after each character, then presses [Enter]"""
+
+
+class TypingModel:
+    """
+    The time waited after each keypress
+
+    Parameters
+    ----------
+    delay: float, default = 100
+        The delay between each keypress (in ms)
+    """
+
+    def __init__(self, delay: float = 100) -> None:
+        self.delay = max(0., float(delay))
+
+    def delays(self, word: str) -> typing.List[float]:
+        """
+        Parameters
+        ----------
+        word: str
+
+        Returns
+        -------
+        list[float]
+            The delay to wait after each character of the word (in ms)
+        """
+        return [self.delay] * len(word)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(delay={self.delay})"
+
+
+class ConstantDelay(TypingModel):
+    """Waits the same delay after each keypress, like `Locator.type` does"""
+
+
+class GaussianDelay(TypingModel):
+    """
+    Draws the delay after each keypress from a normal distribution
+
+    Parameters
+    ----------
+    delay: float, default = 100
+        The mean delay between each keypress (in ms)
+    deviation: float, default = None
+        The standard deviation of the delays (in ms). Defaults to a third of `delay`.
+    seed: int, default = None
+        The seed of the random generator, to replay the same delays
+    """
+
+    def __init__(self, delay: float = 100, deviation: typing.Optional[float] = None, seed: typing.Optional[int] = None) -> None:
+        super().__init__(delay)
+        self.deviation = self.delay / 3 if deviation is None else max(0., float(deviation))
+        self._random = random.Random(seed)
+
+    def delays(self, word: str) -> typing.List[float]:
+        return [max(0., self._random.gauss(self.delay, self.deviation)) for _ in word]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(delay={self.delay}, deviation={self.deviation})"
+
+
+class NoDelay(TypingModel):
+    """Types as fast as possible, which is only meant for local benchmarking"""
+
+    def __init__(self, delay: float = 0) -> None:
+        super().__init__(0)
+
+
+def get_typing_model(name: str, delay: float = 100, deviation: typing.Optional[float] = None) -> TypingModel:
+    """
+    Parameters
+    ----------
+    name: str
+        The name of the typing model (see `TYPING_MODELS`)
+    delay: float, default = 100
+        The (mean) delay between each keypress (in ms)
+    deviation: float, default = None
+        The standard deviation of the delays, for the "gaussian" model (in ms)
+
+    Returns
+    -------
+    TypingModel
+
+    Raises
+    ------
+    ValueError
+        When the typing model doesn't exist
+    """
+    if name == "constant":
+        return ConstantDelay(delay)
+    if name == "gaussian":
+        return GaussianDelay(delay, deviation=deviation)
+    if name == "zero":
+        return NoDelay()
+    raise ValueError(f"Unknown typing model '{name}' (available: {', '.join(TYPING_MODELS)})")
+
+
+class _BaseSubmitter:
+    """
+    Types the answers into the game input and submits them
+
+    Parameters
+    ----------
+    mode: str, default = "keys"
+        How the answers are sent (see `SUBMIT_MODES`).
+        "keys" needs a driver round trip per character while "script" sends the word and [Enter] at once.
+    model: TypingModel, default = None
+        The time waited after each keypress. Defaults to a constant 100 ms delay.
+    """
+
+    def __init__(self, mode: str = "keys", model: typing.Optional[TypingModel] = None) -> None:
+        if mode not in SUBMIT_MODES:
+            raise ValueError(f"Unknown submit mode '{mode}' (available: {', '.join(SUBMIT_MODES)})")
+        self.mode = mode
+        self.model = ConstantDelay() if model is None else model
+
+
+class Submitter(_BaseSubmitter):
+    """Types the answers into the game input and submits them"""
+
+    def submit(self, textbox: Locator, word: str) -> None:
+        """
+        Types the word and presses [Enter]
+
+        Parameters
+        ----------
+        textbox: Locator
+            The game input
+        word: str
+        """
+        delays = self.model.delays(word)
+        if self.mode == "script":
+            textbox.evaluate(SUBMIT_SCRIPT, {"word": word, "delays": delays})
+            return
+        if isinstance(self.model, ConstantDelay) or not any(delays):
+            textbox.type(word, delay=delays[0] if delays else 0)
+        else:
+            for character, delay in zip(word, delays):
+                textbox.type(character)
+                time.sleep(delay / 1000)
+        textbox.press("Enter")
+
+
+class AsyncSubmitter(_BaseSubmitter):
+    """Types the answers into the game input and submits them, from the asyncio engine"""
+
+    async def submit(self, textbox: AsyncLocator, word: str) -> None:
+        """
+        Types the word and presses [Enter]
+
+        Parameters
+        ----------
+        textbox: playwright.async_api.Locator
+            The game input
+        word: str
+        """
+        delays = self.model.delays(word)
+        if self.mode == "script":
+            await textbox.evaluate(SUBMIT_SCRIPT, {"word": word, "delays": delays})
+            return
+        if isinstance(self.model, ConstantDelay) or not any(delays):
+            await textbox.type(word, delay=delays[0] if delays else 0)
+        else:
+            for character, delay in zip(word, delays):
+                await textbox.type(character)
+                await asyncio.sleep(delay / 1000)
+        await textbox.press("Enter")
@@ -0,0 +1,159 @@
+"""keeps track of the words played during a game"""
+import typing
+
+from playwright.async_api import Frame as AsyncFrame
+from playwright.sync_api import Frame
+
+OTHER_WORDS_HOOK = """() => {
+    if (window.__jklmbotOtherWords !== undefined) {
+        // already hooked: forgets the words recorded during the previous round
+        window.__jklmbotOtherWords.splice(0);
+        return true;
+    }
+    if (typeof socket === "undefined") {
+        return false;
+    }
+    window.__jklmbotOtherWords = [];
+    const lastWords = {};
+    socket.on("setPlayerWord", (peerId, word) => { lastWords[peerId] = word; });
+    socket.on("correctWord", ({ playerPeerId }) => {
+        if (playerPeerId in lastWords) {
+            window.__jklmbotOtherWords.push(lastWords[playerPeerId]);
+        }
+    });
+    return true;
+}"""
+"""Hooks the game socket to record the words accepted from every player, or empties the recorded words if it is already hooked"""
+
+OTHER_WORDS_DRAIN = """() => (window.__jklmbotOtherWords || []).splice(0)"""
+"""Returns and forgets the words recorded since the last call"""
+
+
+class UsedWords:
+    """
+    The set of words which can't be played anymore during the current game
+
+    Parameters
+    ----------
+    track_others: bool, default = False
+        If the words submitted by the other players should be recorded too
+    """
+
+    def __init__(self, track_others: bool = False) -> None:
+        self.track_others = bool(track_others)
+        self._words: typing.Set[str] = set()
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str) -> None:
+        """
+        Records a word played by the bot
+
+        Parameters
+        ----------
+        word: str
+        """
+        self._words.add(word)
+
+    def record(self, words: typing.Iterable[str]) -> None:
+        """
+        Records the words played by the other players
+
+        Does nothing when `track_others` is disabled.
+
+        Parameters
+        ----------
+        words: Iterable[str]
+        """
+        if self.track_others:
+            self._words.update(str(word).lower() for word in words)
+
+    def reset(self) -> None:
+        """Forgets every word, to be called when a new game starts"""
+        self._words.clear()
+
+    def hook(self, frame: Frame) -> bool:
+        """
+        Starts recording the words played by the other players in the given game frame
+
+        When the frame is already hooked, the words recorded so far are discarded, which makes it suitable for new rounds.
+
+        Parameters
+        ----------
+        frame: Frame
+            The game iframe
+
+        Returns
+        -------
+        bool
+            If the game socket could be hooked
+        """
+        if not self.track_others:
+            return False
+        try:
+            return bool(frame.evaluate(OTHER_WORDS_HOOK))
+        except Exception:
+            return False
+
+    def sync(self, frame: Frame) -> None:
+        """
+        Records the words played by the other players since the last call
+
+        Parameters
+        ----------
+        frame: Frame
+            The game iframe
+        """
+        if not self.track_others:
+            return
+        try:
+            self.record(frame.evaluate(OTHER_WORDS_DRAIN))
+        except Exception:
+            pass
+
+
+class AsyncUsedWords(UsedWords):
+    """The `asyncio` counterpart of `UsedWords`"""
+
+    async def hook(self, frame: AsyncFrame) -> bool:
+        """
+        Starts recording the words played by the other players in the given game frame
+
+        When the frame is already hooked, the words recorded so far are discarded, which makes it suitable for new rounds.
+
+        Parameters
+        ----------
+        frame: playwright.async_api.Frame
+            The game iframe
+
+        Returns
+        -------
+        bool
+            If the game socket could be hooked
+        """
+        if not self.track_others:
+            return False
+        try:
+            return bool(await frame.evaluate(OTHER_WORDS_HOOK))
+        except Exception:
+            return False
+
+    async def sync(self, frame: AsyncFrame) -> None:
+        """
+        Records the words played by the other players since the last call
+
+        Parameters
+        ----------
+        frame: playwright.async_api.Frame
+            The game iframe
+        """
+        if not self.track_others:
+            return
+        try:
+            self.record(await frame.evaluate(OTHER_WORDS_DRAIN))
+        except Exception:
+            pass
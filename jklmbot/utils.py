@@ -0,0 +1,110 @@
+"""helpers shared by the sync and async engines"""
+import base64
+import pathlib
+import random
+import typing
+
+
+def generate_user_id() -> str:
+    """
+    Returns
+    -------
+    str
+    """
+    return "".join(random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+-") for _ in range(16))
+
+
+def is_jpeg(data: bytes) -> bool:
+    """
+    Determine if the given object is a JPEG file
+
+    Parameters
+    ----------
+    data: bytes
+
+    Returns
+    -------
+    bool
+    """
+    buf = data[:max(8192, len(data))]
+    return (len(buf) > 2 and
+            buf[0] == 0xFF and
+            buf[1] == 0xD8 and
+            buf[2] == 0xFF)
+
+
+def get_browser_from_name(name: str):
+    """
+    Parameters
+    ----------
+    name: str
+    """
+    name = str(name).lower().replace(" ", "")
+    if name in ("firefox", "gecko"):
+        return "firefox"
+    elif name in ("webkit", "safari", "mac", "macos", "ios"):
+        return "webkit"
+    else:
+        return "chromium"
+
+
+def encode_picture(picture: typing.Union[str, pathlib.Path, bytes]) -> str:
+    """
+    Encodes the given profile picture for the game settings
+
+    Parameters
+    ----------
+    picture: str | pathlib.Path | bytes
+        The path to the JPEG picture or its content
+
+    Returns
+    -------
+    str
+        The base64 encoded picture
+
+    Raises
+    ------
+    TypeError
+        When the picture is not a JPEG image or is too big
+    """
+    if not isinstance(picture, bytes):
+        with open(picture, "r+b") as f:
+            picture = f.read()
+
+    if not is_jpeg(picture):
+        raise TypeError("❌ The given picture does not seem to be a JPEG image")
+
+    picture = base64.b64encode(picture).decode("utf-8")
+    picture_length = len(picture)
+    if picture_length > 10000:
+        raise TypeError(f"❌ The given picture is too big ({picture_length}/10000)")
+    return picture
+
+
+def settings_script(username: str, picture: str) -> str:
+    """
+    Returns the init script storing the given username and encoded picture in the game settings
+
+    Parameters
+    ----------
+    username: str
+    picture: str
+        The encoded picture
+
+    Returns
+    -------
+    str
+    """
+    return f"""
+        window.localStorage.setItem("jklmSettings", '{{"version":2,"volume":0.5,"muted":false,"chatFilter":[],"nickname":"{username}", "picture": "{picture}"}}')
+        """
+
+
+def random_username() -> str:
+    """
+    Returns
+    -------
+    str
+        A guest username
+    """
+    return f"Guest{''.join(random.choice('0123456789') for _ in range(4))}"
@@ -0,0 +1,62 @@
+"""tests the normalization of the source word lists"""
+import pytest
+
+from jklmbot.data import packed
+from jklmbot.data.build import BuildStats, build_dictionary, normalize_words, split_entry
+from jklmbot.data.packed import load_dictionary
+
+
+@pytest.mark.parametrize("entry, words", [
+    ("tlatta , inani", ["tlatta", "inani"]),
+    ("tlatta;inani/nemi", ["tlatta", "inani", "nemi"]),
+    ("atl (water)", ["atl"]),
+    ("calli [n.]", ["calli"]),
+    ("...", []),
+])
+def test_split_entry(entry, words):
+    assert split_entry(entry) == words
+
+
+@pytest.mark.parametrize("language, entry, words", [
+    ("french", "Œuvre", ["oeuvre"]),
+    ("french", "ex æquo", []),
+    ("french", "cæcum", ["caecum"]),
+    ("french", "l’École", ["l'ecole"]),
+    ("french", "garçon", ["garcon"]),
+    ("german", "Straße", ["strasse"]),
+    ("german", "Grüße", ["grusse"]),
+    ("spanish", "Niño", ["niño"]),
+    ("spanish", "canción", ["cancion"]),
+    ("english", "niño", ["nino"]),
+    ("english", "well-known", ["well-known"]),
+    ("english", "rock'n'roll", ["rock'n'roll"]),
+    ("english", "-ish", []),
+    ("english", "r2d2", []),
+    ("english", "New York", []),
+])
+def test_normalize_words(language, entry, words):
+    assert list(normalize_words([entry], language)) == words
+
+
+def test_normalize_words_stats():
+    stats = BuildStats()
+    words = list(normalize_words(["tlatta , inani", "New York", "r2d2", "tlatta"], "nahuatl", stats))
+    assert words == ["tlatta", "inani", "tlatta"]
+    assert stats.entries == 4
+    assert stats.words == 5
+    assert stats.invalid == {"with spaces": 1, "with invalid characters": 1}
+
+
+def test_build_dictionary(tmp_path, monkeypatch):
+    monkeypatch.setenv(packed.CACHE_ENVIRONMENT_VARIABLE, str(tmp_path / "cache"))
+    source = tmp_path / "words.txt"
+    source.write_text("the\nof\nCafé\nthe\nNew York\nand\n", encoding="utf-8")
+
+    stats = build_dictionary("english", source=source)
+    assert (stats.entries, stats.words, stats.packed, stats.duplicates) == (6, 6, 4, 1)
+    assert stats.invalid == {"with spaces": 1}
+
+    dictionary = load_dictionary("english")
+    assert list(dictionary) == ["and", "cafe", "of", "the"]
+    # the source order is kept to rank the words
+    assert list(dictionary.word_features().ranks) == [3, 2, 1, 0]
@@ -0,0 +1,110 @@
+"""tests the packed dictionary format against a brute-force scan of the words"""
+import array
+import random
+import struct
+import sys
+
+import pytest
+
+from jklmbot.data import packed
+from jklmbot.data.packed import PackedDictionary, load_dictionary, missing_dictionaries, pack, packed_path
+
+LETTERS = "aeioulnrst"
+
+
+def random_words(count, seed=0):
+    """Returns `count` distinct random words, in a random order, with some of them repeated"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 8))))
+    words = list(words)
+    rng.shuffle(words)
+    return words + words[:count // 10]
+
+
+def syllables(words, seed=0):
+    """Returns the syllables to look up: every letter, some substrings of the words, longer ones and missing ones"""
+    rng = random.Random(seed)
+    found = [word[start:start + length] for word in rng.sample(words, 50)
+             for length in (2, 3, 4, 5) for start in range(max(len(word) - length + 1, 0))]
+    return list(LETTERS) + found + ["zz", "qa", "aaaaaaa"]
+
+
+def check_round_trip(words, path):
+    count = pack(words, path)
+    dictionary = PackedDictionary(path)
+    expected = sorted(set(words))
+
+    assert count == len(dictionary) == len(expected)
+    assert list(dictionary) == expected
+    assert dictionary[-1] == expected[-1]
+    assert dictionary[10:20] == expected[10:20]
+    assert expected[len(expected) // 2] in dictionary
+    assert "zzz" not in dictionary
+
+    index = dictionary.syllable_index()
+    for syllable in syllables(expected):
+        assert list(index.candidates(syllable)) == [word for word in expected if syllable in word], syllable
+        positions = list(index.positions(syllable))
+        assert positions == sorted(positions)
+
+    first_positions = {}
+    for word in words:
+        first_positions.setdefault(word, len(first_positions))
+    assert list(dictionary.word_features().ranks) == [first_positions[word] for word in expected]
+    return dictionary
+
+
+def test_round_trip_small(tmp_path):
+    dictionary = check_round_trip(random_words(2000), tmp_path / "small.jkd")
+    assert dictionary._posting_size == 2
+
+
+def test_round_trip_large(tmp_path):
+    dictionary = check_round_trip(random_words(70000), tmp_path / "large.jkd")
+    assert dictionary._posting_size == 4
+
+
+def test_round_trip_other_byte_order(tmp_path, monkeypatch):
+    # the sections get byte-swapped both when writing and reading
+    monkeypatch.setattr(sys, "byteorder", "big" if sys.byteorder == "little" else "little")
+    check_round_trip(random_words(2000), tmp_path / "swapped.jkd")
+
+
+def test_typed_view_byteswap(monkeypatch):
+    if sys.byteorder == "big":
+        pytest.skip("the host is big-endian")
+    # pretending to be big-endian makes this host handle big-endian data like a big-endian host handles the files
+    monkeypatch.setattr(sys, "byteorder", "big")
+    values = [1, 2, 70000]
+    assert list(packed._typed_view(memoryview(struct.pack(">3I", *values)), "I")) == values
+    assert packed._little_endian(array.array("I", values)) == struct.pack(">3I", *values)
+
+
+def test_other_version(tmp_path, monkeypatch):
+    monkeypatch.setenv(packed.CACHE_ENVIRONMENT_VARIABLE, str(tmp_path))
+    path = packed_path("english")
+    assert path.parent == tmp_path
+    assert missing_dictionaries(["english"]) == ["english"]
+    with pytest.raises(FileNotFoundError):
+        load_dictionary("english")
+
+    pack(["hello", "world"], path)
+    assert missing_dictionaries(["english"]) == []
+    assert list(load_dictionary("english")) == ["hello", "world"]
+
+    with open(path, "r+b") as f:
+        f.seek(8)
+        f.write(struct.pack("<I", packed.VERSION + 1))
+    assert missing_dictionaries(["english"]) == ["english"]
+    with pytest.raises(ValueError):
+        PackedDictionary(path)
+    with pytest.raises(FileNotFoundError):
+        load_dictionary("english")
+
+
+def test_missing_source(tmp_path, monkeypatch):
+    monkeypatch.setenv(packed.CACHE_ENVIRONMENT_VARIABLE, str(tmp_path))
+    with pytest.raises(ModuleNotFoundError):
+        load_dictionary("klingon")